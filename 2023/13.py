@@ -3,7 +3,8 @@ from __future__ import annotations
 from typing import Iterator
 from itertools import chain
 
-from utils import transpose, section
+from aoc.itertools import iter_blocks
+from utils import transpose, section, lmap
 from utils_types import Grid
 
 
@@ -32,16 +33,9 @@ def find_row_reflection(grid: Grid[str], smudge: bool = False) -> int:
     return 0
 
 
-def build_scenes(data: Iterator[str]) -> list[Grid[str]]:
-    """Retrieve all the data to begin with."""
-    scenes: list[Grid[str]] = [[]]
-    for row in data:
-        if not row:
-            scenes.append([])
-        else:
-            scenes[-1].append(list(row))
-
-    return scenes
+def build_scenes(data: Iterator[str]) -> Iterator[Grid[str]]:
+    """Retrieve the scenes one at a time, they are separated by empty lines."""
+    return (lmap(list, block) for block in iter_blocks(data))
 
 
 @section(year=2023, day=13, part=1, sol=27300)
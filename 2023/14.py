@@ -3,59 +3,59 @@ from __future__ import annotations
 from typing import Iterator
 import re
 from itertools import pairwise, starmap
-from collections import Counter
 from utils import section
-from utils import lmap, transpose, rotate90, compose
-from utils_types import Grid
+from utils import compose
+from aoc.grid import Grid
 
 
 def tilt_north(grid: Grid[str]) -> Grid[str]:
-    """Tilte all the round rocks to the north"""
-    grid = transpose(grid)        # easier to work with transpose
-    tilted_grid, n = [], len(grid)
-    for row in grid:
+    """Tilte all the round rocks to the north, in place. The grid can be a view: see `tilt_cycle`."""
+    n = grid.shape[0]
+    for j, col in enumerate(grid.cols):
         # gather square rock indexes
-        rock_indexes = [j for j, e in enumerate(row) if e == "#"]
+        rock_indexes = [i for i, e in enumerate(col) if e == "#"]
         # create segments to work on
         segments = pairwise([-1] + rock_indexes + [n])
         # keep only non empty segments
         segments = filter(lambda x: x[1] - x[0] > 2, segments)
 
-        new_row = row.copy()
-        for j0, j1 in segments:
-            r = slice(j0 + 1, j1)           # range between rocks
-            c = Counter(row[r])
-            # replace segment with tilted rocks
-            new_row[r] = list("O" * c['O'] + "." * c['.'])
-        tilted_grid.append(new_row)
-    return transpose(tilted_grid)     # revert original transpose
+        for i0, i1 in segments:
+            rocks = col[i0 + 1:i1].count("O")
+            # replace segment with tilted rocks, writing only the cells that change
+            for i, e in enumerate("O" * rocks + "." * (i1 - i0 - 1 - rocks), start=i0 + 1):
+                if col[i] != e:
+                    grid[i, j] = e
+    return grid
 
 
 def tilt_cycle(grid: Grid[str]) -> Grid[str]:
-    """Tilte all the round rocks in all four directions as a cycle (N, W, S, E)"""
-    return compose(rotate90, tilt_north, repeat=4)(grid)
+    """Tilte all the round rocks in all four directions as a cycle (N, W, S, E), in place.
+    Each direction is the north of a view on the grid, that shares its cells: nothing is copied."""
+    for view in (grid, grid.T, grid.flip(0), grid.T.flip(0)):
+        tilt_north(view)
+    return grid
 
 
 def total_load(grid: Grid[str]) -> int:
     """Compute total load metric as the sum of the rock distances from bottom."""
     def row_load(i, row) -> int:
         # distance from bottom times the number of round rocks
-        return (len(grid[0]) - i) * Counter(row)["O"]
+        return (grid.shape[0] - i) * row.count("O")
 
-    return sum(starmap(row_load, enumerate(grid)))
+    return sum(starmap(row_load, enumerate(grid.rows)))
 
 
 @section(year=2023, day=14, part=1, sol=105208)
 def part_1(data: Iterator[str]) -> int:
     """Code for section 1"""
-    grid = lmap(list, data)
+    grid = Grid.from_strings(list(data))
     return compose(total_load, tilt_north)(grid)
 
 
 @section(year=2023, day=14, part=2, sol=102943)
 def part_2(data: Iterator[str]) -> int:
     """Code for section 2"""
-    grid = lmap(list, data)
+    grid = Grid.from_strings(list(data))
     remaining_steps = 1_000_000_000
 
     # use regex to find a repeting sequence at the end
@@ -1,11 +1,13 @@
 """Resolve a daily problem"""  # pylint: disable=invalid-name
 from __future__ import annotations
 from typing import Iterator
-import matplotlib.pyplot as plt
 
+from aoc import lazy_import
 from utils import section
 from utils_types import Coordinate
 
+plt = lazy_import("matplotlib.pyplot")  # only needed for the visualization
+
 VERBOSE = True
 directions: dict[str, Coordinate] = {'R': (1, 0), 'L': (-1, 0), 'U': (0, 1), 'D': (0, -1)}
 
@@ -6,6 +6,7 @@ from copy import deepcopy
 import operator
 from queue import LifoQueue
 
+from aoc.itertools import iter_blocks
 from utils import section, lmap
 
 operators = {'<': operator.lt, '>': operator.gt}
@@ -120,9 +121,7 @@ class Workflow:
 def create_workflows(data: Iterator[str]) -> dict[str, Workflow]:
     """Consume data iterator to create workflows until there is an empty line."""
     workflows = {}
-    for row in data:
-        if not row:
-            break
+    for row in next(iter_blocks(data)):
         name, rules = row.split('{')
         rules = rules[:-1].split(',')
         workflows[name] = Workflow(lmap(Rule.from_repr, rules[:-1]), final=rules[-1])
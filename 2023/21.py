@@ -1,10 +1,11 @@
 """Resolve a daily problem"""  # pylint: disable=invalid-name
 from __future__ import annotations
 from typing import Optional, Iterator
-from queue import Queue
-from copy import deepcopy
-from utils import section, lmap, neighborhood, enumerate_grid, print_grid
-from utils_types import Coordinate, Grid
+from collections import deque
+from utils import section, print_grid
+from utils_types import Coordinate
+from aoc.grid import Grid
+from aoc.utils import Neighborhood
 
 VERBOSE = True
 
@@ -12,33 +13,40 @@ VERBOSE = True
 def bfs_steps(
     grid: Grid[str], max_depth: int,
     start: Optional[Coordinate] = None
-) -> set[Coordinate]:
-    """Compute all the steps the elf gardener can make from a starting position.
-    Default: start is the 'S' tile in the center.
+) -> set[int]:
+    """Compute all the steps the elf gardener can make from a starting position, as linear indices of the grid.
+    Default: start is the 'S' tile in the center. A start out of the grid enters it at depth 1.
 
     BFS on a graph: keep only postions whose depth as the same parity than `max_depth`."""
-    n, m = len(grid), len(grid[0])
+    n, m = grid.shape
     if start is None:
-        start = [p for p, e in enumerate_grid(grid) if e == 'S'][0]
-
-    final_positions = set[Coordinate]()
-    queue = Queue[tuple[Coordinate, int]]()  # keep depth
-    queue.put((start, 0))
-    seen = set[Coordinate]()
-    while not queue.empty():
-        pos, depth = queue.get()
-
-        if depth > max_depth or pos in seen:
+        start = grid.argwhere('S')[0]
+
+    queue = deque[tuple[int, int]]()  # keep depth
+    if grid.is_valid(start):
+        queue.append((grid.index(start), 0))
+    else:
+        (i, j) = start
+        entries = ((i + di, j + dj) for di, dj in Neighborhood('c4'))
+        queue.extend((grid.index(p), 1) for p in entries if grid.is_valid(p) and grid[p] != '#')
+
+    final_positions = set[int]()
+    seen = bytearray(n * m)
+    while queue:
+        k, depth = queue.popleft()
+
+        if depth > max_depth or seen[k]:
             continue
-        seen.add(pos)
+        seen[k] = 1
 
         if depth % 2 == max_depth % 2:
-            final_positions.add(pos)  # will be a valid position when max_depth is reached
+            final_positions.add(k)  # will be a valid position when max_depth is reached
 
-        for ni, nj in neighborhood(pos, (n, m), connectivity=4):
-            if grid[ni][nj] == '#' or (ni, nj) in seen:
+        # the neighbors inside the grid are precomputed once for its shape
+        for c in grid.neighbors(k):
+            if seen[c] or grid.at(c) == '#':
                 continue
-            queue.put(((ni, nj), depth + 1))
+            queue.append((c, depth + 1))
 
     return final_positions
 
@@ -46,15 +54,15 @@ def bfs_steps(
 @section(year=2023, day=21, part=1, sol=3542)
 def part_1(data: Iterator[str]) -> int:
     """Code for section 1"""
-    grid = lmap(list, data)
+    grid = Grid.from_strings(list(data))
     final_positions = bfs_steps(grid, max_depth=64)
     if VERBOSE:
         with open('visualizations/21.txt', "w", encoding="utf-8") as f:
-            str_grid = deepcopy(grid)
-            for ni, nj in final_positions:
-                if (ni, nj) != (65, 65):
-                    str_grid[ni][nj] = 'O'
-            print_grid(str_grid, f, join='')
+            str_grid = grid.copy()
+            for k in final_positions:
+                if grid.coord(k) != (65, 65):
+                    str_grid.set_at(k, 'O')
+            print_grid(list(str_grid.rows), f, join='')
     return len(final_positions)
 
 
@@ -69,7 +77,7 @@ def part_2(data: Iterator[str]) -> int:
     It was also possible to do it with a polynomial equation,
     but it seemed a little too obscure to me.
     """
-    grid = lmap(list, data)
+    grid = Grid.from_strings(list(data))
     n = (26501365 - 65) // 131
 
     full_even = len(bfs_steps(grid, max_depth=130))
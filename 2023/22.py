@@ -3,17 +3,18 @@ from __future__ import annotations
 from typing import Iterator, Iterable, Optional
 from dataclasses import dataclass, field
 from copy import deepcopy
+from random import random
 
-import matplotlib.pyplot as plt
-# pylint: disable-next=unused-import  # It has the side effect to allow 3D projection
-from mpl_toolkits.mplot3d import Axes3D
-import numpy as np
-from numpy.random import sample
 from tqdm import tqdm
 
+from aoc import lazy_import
 from utils import section, lmap, lfilter
 from utils_types import Coordinate3D, Coordinate
 
+# only needed for the display
+plt = lazy_import("matplotlib.pyplot")
+np = lazy_import("numpy")
+
 VERBOSE = False
 
 
@@ -23,7 +24,7 @@ class Brick:
     direction: int
     length: int
     pos: Coordinate3D
-    color: tuple[float, ...] = field(default_factory=lambda: tuple(sample(size=3)))  # display color
+    color: tuple[float, ...] = field(default_factory=lambda: (random(), random(), random()))  # display color
     proj: set[Coordinate] = field(init=False)                      # projection in (x,y) coordinates
 
     def __post_init__(self) -> None:
@@ -104,6 +105,8 @@ class SandFall:
         if not VERBOSE:
             self.fig, self.ax = None, None
             return
+        # pylint: disable-next=import-outside-toplevel,unused-import  # side effect to allow 3D projection
+        from mpl_toolkits.mplot3d import Axes3D
         self.fig = plt.figure()
         self.ax = self.fig.add_subplot(111, projection='3d')
         plt.show(block=False)
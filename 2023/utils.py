@@ -5,10 +5,12 @@ from itertools import chain
 from functools import reduce
 from pathlib import Path
 import time
-import requests
 
+from aoc import lazy_import
 from utils_types import T, S, Coordinate, Grid, Args
 
+requests = lazy_import("requests")  # only needed to download missing inputs
+
 #  ============================
 #
 #  Specific to advent of code
@@ -75,9 +77,10 @@ def load_input(year, day, path: Optional[str] = None):
 
 
 def lines_of_file(path: str) -> Iterator[str]:
-    """Return all lines of a file as an iterator. Remove the `\n` escape character."""
+    """Return all lines of a file as an iterator, read lazily. Remove the `\n` escape character."""
     with open(path, "r", encoding="utf-8") as file:
-        return map(lambda s: s[:-1], file.readlines())
+        for line in file:
+            yield line.removesuffix("\n")
 
 
 def print_answer(answer, day: int, part: int, print_fn=print) -> None:
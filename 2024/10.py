@@ -1,32 +1,31 @@
 from collections.abc import Iterator
 from aoc import section, load_input
-from aoc.grid import Grid
-from aoc.utils import Neighborhood, Coordinate
+from aoc.grid import DIGITS, Grid
 
-def follow_path(grid: Grid[int], start: Coordinate) -> list[Coordinate]:
-    """Returns all the coordinates of the peaks reached from the start, by a smooth, continuous increment.
+def follow_path(grid: Grid[int], start: int) -> list[int]:
+    """Returns the linear indices of the peaks reached from the start, by a smooth, continuous increment.
     Warning: There can be duplicates if there is multiple paths."""
-    assert grid[start] == 0
+    assert grid.at(start) == 0
 
-    def step(p: Coordinate) -> Iterator[Coordinate] :
-        if grid[p] == 9:
-            return iter((p,))
-        return (q for d in Neighborhood('c4') if grid.is_valid(p + d) and grid[p + d] == grid[p] + 1 for q in step(p + d))
+    def step(k: int) -> Iterator[int]:
+        if (height := grid.at(k)) == 9:
+            return iter((k,))
+        return (q for c in grid.neighbors(k) if grid.at(c) == height + 1 for q in step(c))
 
     return list(step(start))
 
 @section.p1(sol=531)
 def part_1() -> int:
     """Code for section 1"""
-    grid = Grid.from_strings(load_input()).map(int)
-    return sum(len(set(follow_path(grid, Coordinate(p)))) for p, e in grid.enumerate() if e == 0)
+    grid = Grid.from_bytes(load_input(mode="bytes").data, DIGITS)
+    return sum(len(set(follow_path(grid, grid.index(p)))) for p in grid.argwhere(0))
 
 
 @section.p2(sol=1210)
 def part_2() -> int:
     """Code for section 2"""
-    grid = Grid.from_strings(load_input()).map(int)
-    return sum(len(follow_path(grid, Coordinate(p))) for p, e in grid.enumerate() if e == 0)
+    grid = Grid.from_bytes(load_input(mode="bytes").data, DIGITS)
+    return sum(len(follow_path(grid, grid.index(p))) for p in grid.argwhere(0))
 
 
 if __name__ == "__main__":
@@ -2,22 +2,28 @@ import re
 
 from aoc import section, load_input
 
-MUL = re.compile(r"mul\((\d{1,3}),(\d{1,3})\)")
-ENABLE = re.compile(r"do\(\)(.+?)don't\(\)")
+MUL = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)")
+INSTRUCTION = re.compile(rb"mul\((\d{1,3}),(\d{1,3})\)|(do|don't)\(\)")
 
 
-@section.p1()
-def part_1(sol=168539636) -> int:
+@section.p1(sol=168539636)
+def part_1() -> int:
     """Code for section 1"""
-    data = " ".join(load_input())
-    return sum(int(n1) * int(n2) for n1, n2 in  MUL.findall(data))
-    
+    # the instructions never span several lines, so the raw bytes can be scanned at once
+    data = load_input(mode="bytes").data
+    return sum(int(n1) * int(n2) for n1, n2 in MUL.findall(data))
+
 
 @section.p2(sol=97529391)
 def part_2() -> int:
     """Code for section 2"""
-    data = "do()" + " ".join(load_input()) + "don't()"
-    return sum(int(n1) * int(n2) for e in ENABLE.findall(data) for n1, n2 in  MUL.findall(e))
+    enabled, total = True, 0
+    for m in INSTRUCTION.finditer(load_input(mode="bytes").data):
+        if m[3]:
+            enabled = m[3] == b"do"
+        elif enabled:
+            total += int(m[1]) * int(m[2])
+    return total
 
 
 if __name__ == "__main__":
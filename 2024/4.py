@@ -4,25 +4,31 @@ from aoc.utils import Coordinate, Direction, Neighborhood
 
 
 def is_word(grid: Grid, pos: Coordinate, d: Direction, word="XMAS") -> bool:
-    return all(grid.is_valid(p := pos + k*d) and grid[p] == l for k, l in enumerate(word))
+    """Whether the word is written from `pos` in the direction `d`. It is inside the grid if its last letter is,
+    then its letters are read through their linear indices."""
+    (i, j), (di, dj), last = pos, d, len(word) - 1
+    if not (grid.is_valid(pos) and grid.is_valid((i + last*di, j + last*dj))):
+        return False
+    k, dk = grid.index(pos), di*grid.stride + dj*grid.step
+    return all(grid.at(k + n*dk) == letter for n, letter in enumerate(word))
 
 
 @section.p1(sol=2427)
 def part_1() -> int:
     """Code for section 1"""
-    grid = Grid([list(r) for r in load_input()])
-    return sum(is_word(grid, Coordinate(pos), d)  for pos, c in grid.enumerate() if c=="X" for d in Neighborhood())
+    grid = Grid.from_strings(load_input())
+    return sum(is_word(grid, pos, d) for pos in grid.argwhere("X") for d in Neighborhood())
 
 
 @section.p2(sol=1900)
 def part_2() -> int:
     """Code for section 2"""
-    grid = Grid([list(r) for r in load_input()])
+    grid = Grid.from_strings(load_input())
 
     def count_x_mas(pos: Coordinate) -> int:
         return sum(is_word(grid, pos - d, d, word="MAS") for d in Neighborhood("cross"))
     
-    return sum(count_x_mas(Coordinate(pos)) == 2  for pos, c in grid.enumerate() if c == "A")
+    return sum(count_x_mas(Coordinate(pos)) == 2  for pos in grid.argwhere("A"))
 
 
 if __name__ == "__main__":
@@ -1,21 +1,28 @@
 from collections import defaultdict
 
-from aoc import section, load_input
+from aoc import section, load_input, cached_parse
 
 
-def parse(data: list[str]):
-    """Parse input into ..."""
+@cached_parse
+def parse_input(data: tuple[str, ...]) -> tuple[dict[int, set[int]], list[tuple[int, ...]]]:
+    """Parse input into the page orderings and the manuals."""
     i = data.index('')
     orders = defaultdict(set[int])
     for o in data[:i]:
         x1, x2 = o.split("|")
         orders[int(x1)].add(int(x2))
+    manuals = [tuple(map(int, m.split(","))) for m in data[i+1:]]
+    return orders, manuals
+
+
+def parse(data: tuple[str, ...]):
+    """Parse input into the page orderings and the manuals made of pages comparable with each other."""
+    orders, manuals = parse_input(data)
 
     class Page(int):
         def __lt__(self, p2): return self not in orders[p2]
 
-    manuals = [tuple(map(Page, m.split(","))) for m in data[i+1:]]
-    return orders, manuals
+    return orders, [tuple(map(Page, m)) for m in manuals]
 
 
 def is_right_ordered(m) -> bool:
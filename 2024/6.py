@@ -1,8 +1,8 @@
-from multiprocess.pool import Pool
 from copy import deepcopy
-from aoc import section, load_input
+from aoc import section, load_input, run_day
 from aoc.grid import Grid
-from aoc.utils import Coordinate, Direction, Neighborhood
+from aoc.parallel import map_grid
+from aoc.utils import Direction, Neighborhood
 
 N, S, E, W = Neighborhood('c4')
 TURN = {N: E, E: S, S: W, W: N}
@@ -12,57 +12,73 @@ class Loop(Exception): ...
 
 
 def forward(grid: Grid[str], start: tuple[int, int], d: Direction, write=True) -> None:
-    pos = Coordinate(start)
-    seen = set()
-    while grid.is_valid(pos + d):
-        if (pos + d, d) in seen:
+    # hot loop: the cells are read through their linear index, only the bounds are checked on the coordinates
+    (n, m), (i, j), (di, dj), (si, sj) = grid.shape, start, d, (grid.stride, grid.step)
+    k, dk, seen = grid.index(start), di * si + dj * sj, set()
+    while 0 <= i + di < n and 0 <= j + dj < m:
+        if (k + dk, d) in seen:
             raise Loop()
 
-        if grid[pos + d] in "#O":
-            seen.add((pos + d, d))
+        if (c := grid.at(k + dk)) in "#O":
+            seen.add((k + dk, d))
             d = TURN[d]
-        elif grid[pos + d] in ".<^>v":
-            pos += d
+            di, dj = d
+            dk = di * si + dj * sj
+        elif c in ".<^>v":
+            i, j, k = i + di, j + dj, k + dk
         else:
-            raise ValueError(grid[pos + d])
+            raise ValueError(c)
 
         if write:
-            grid[pos] = REPR[d]
+            grid.set_at(k, REPR[d])
 
 
 @section.p1(sol=4722)
 def part_1() -> int:
     """Code for section 1"""
-    data = Grid([list(r) for r in load_input()])
+    data = Grid.from_bytes(load_input(mode="bytes").data)
     start = next((p for p, e in data.enumerate() if e == "^"))
     forward(data, start, d=N)
     print(str(data).replace(" ", ""))
     return sum(c in REPR.values() for _, c in data.enumerate())
 
 
+def is_loop(grid: Grid[str], pos: tuple[int, int], start: tuple[int, int]) -> bool:
+    """Whether adding an obstacle at `pos` traps the guard in a loop."""
+    try:
+        grid[pos] = "O"  # try obstacle
+        forward(grid, start, N, write=False)
+    except Loop:
+        return True
+    finally:
+        grid[pos] = "."  # revert obstacle
+    return False
+
+
+def candidates(grid: Grid[str]) -> tuple[tuple[int, int], list[tuple[int, int]]]:
+    """Start of the guard and the positions of its path, where an obstacle can be added."""
+    start = next((p for p, e in grid.enumerate() if e == "^"))
+    path = deepcopy(grid)
+    forward(path, start, N)
+    return start, [p for p, e in path.enumerate() if e in REPR.values() if p != start]
+
+
 @section.p2(sol=1602)
 def part_2() -> int:
     """Code for section 2"""
-    data = Grid([list(r) for r in load_input()])
-    start = next((p for p, e in data.enumerate() if e == "^"))
-    path = deepcopy(data)
-    forward(path, start, N)
+    data = Grid.from_bytes(load_input(mode="bytes").data)
+    start, path_pos = candidates(data)
+    # each worker tries its obstacles on its own overlay of the grid, shared between the processes
+    return sum(map_grid(is_loop, data, path_pos, start))
 
-    def is_loop(pos) -> bool:
-        try:
-            data[pos] = "O"  # try obstacle
-            forward(data, start, N, write=False)
-        except Loop:
-            return True
-        finally:
-            data[pos] = "."  # revert obstacle
-        return False
 
-    path_pos = [p for p, e in path.enumerate() if e in REPR.values() if p != start]
-    pool = Pool()  # note: I don't know why it works as I update the same grid for the forward
-    return sum(pool.map(is_loop, path_pos))
+@section.p2(sol=1602, variant="serial")
+def part_2_serial() -> int:
+    """Code for section 2, in a single process"""
+    data = Grid.from_bytes(load_input(mode="bytes").data)
+    start, path_pos = candidates(data)
+    return sum(is_loop(data, p, start) for p in path_pos)
 
 
 if __name__ == "__main__":
-    part_1()
-    part_2()
+    run_day()
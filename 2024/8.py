@@ -26,7 +26,7 @@ def part_1() -> int:
         for p in ((a + d), (b - d)):
             if data.is_valid(p):
                 data[p] = "#"
-    return sum( c == "#" for c in data )
+    return data.count("#")
 
 
 @section.p2(sol=1221)
@@ -40,7 +40,7 @@ def part_2() -> int:
             while data.is_valid(p := fn(k * (a - b))):
                 data[p] = "#"
                 k += 1
-    return sum( c == "#" for c in data )
+    return data.count("#")
 
 
 if __name__ == "__main__":
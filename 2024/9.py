@@ -1,7 +1,7 @@
 from operator import attrgetter
 from dataclasses import dataclass
 
-from aoc import section, load_input
+from aoc import section, load_input, phase
 from aoc.itertools import lmap
 
 
@@ -37,7 +37,8 @@ def parse(raw_data: list[str]):
 @section.p1(sol=6386640365805)
 def part_1() -> int:
     """Code for section 1"""
-    disk, _, _ = parse(load_input())
+    with phase("parse"):
+        disk, _, _ = parse(load_input())
 
     reverse_data_disk = ((i, disk[i]) for i in range(len(disk)-1,-1, -1) if disk[i] != -1)
     for i in filter(lambda i: disk[i] == -1, range(len(disk))):
@@ -56,7 +57,8 @@ def part_1() -> int:
 @section.p2(sol=6423258376982)
 def part_2() -> int:
     """Code for section 2"""
-    disk, free, data = parse(load_input())
+    with phase("parse"):
+        disk, free, data = parse(load_input())
 
     # make sur the free slots are sorted by space, the order is kept during the whole process
     free.sort(key=attrgetter("pos"))
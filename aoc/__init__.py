@@ -1,34 +1,203 @@
-from typing import Optional, Callable, TypeVar, TypeVarTuple
+from __future__ import annotations
+from typing import Any, Literal, Optional, Callable, TypeVar, TypeVarTuple, overload, TYPE_CHECKING
+from array import array
+from collections.abc import Iterator
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
-from time import time
-from functools import partial
-import requests
+from time import perf_counter_ns
+from functools import lru_cache, partial
+import io
+import mmap
+import os
+import re
 import sys
+import warnings
 
+from .lazy import lazy_import
+from . import modes
+from .context import Context, Phase, current as _context, phase
 
-def _section(part: int, sol: Optional[int] = None):
+# the modes are off by default, their modules are only imported when used (see `aoc.modes`)
+bench = lazy_import("aoc.bench")
+memory = lazy_import("aoc.memory")
+profiling = lazy_import("aoc.profiling")
+# only needed to download missing inputs
+fetch = lazy_import("aoc.fetch")
+
+if TYPE_CHECKING:
+    from .memory import Memory
+
+
+def __getattr__(name: str) -> Any:
+    # `aoc.cached_parse` is imported when first used, along with the pickling and hashing it needs
+    if name == "cached_parse":
+        from .cache import cached_parse  # pylint: disable=import-outside-toplevel
+        return cached_parse
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@dataclass
+class Result:
+    """Outcome of a decorated part: its answer and execution time, along with where it comes from.
+    `error` is only filled when the part could not be executed (see `aoc.runner`) or exceeded its timeout.
+    `cached` is set when the result comes from a previous run (see `aoc.incremental`)."""
+    year: int
+    day: int
+    part: int
+    answer: Any
+    execution_time: float
+    sol: Any = None
+    error: Optional[str] = None
+    stats: Optional[bench.Stats] = None
+    source: Optional[Path] = None
+    inputs: list[Path] = field(default_factory=list)
+    phases: Optional[Phase] = None
+    memory: Optional[Memory] = None
+    max_mb: Optional[float] = None
+    budget: Optional[float] = None
+    variant: Optional[str] = None
+    cached: bool = False
+
+    @property
+    def verified(self) -> Optional[bool]:
+        """Whether the answer matches the solution, None if no solution is known."""
+        return None if self.sol is None or self.error else self.answer == self.sol
+
+    @property
+    def over_memory(self) -> bool:
+        """Whether the part used more memory than its budget."""
+        return self.max_mb is not None and self.memory is not None and self.memory.peak > self.max_mb
+
+    @property
+    def over_budget(self) -> bool:
+        """Whether the part took more time than its budget."""
+        return self.budget is not None and not self.error and self.execution_time > self.budget
+
+    @property
+    def failures(self) -> list[str]:
+        """Reasons why the part failed its checks. The time budget is only checked in strict mode."""
+        failures = []
+        if self.verified is False:
+            failures.append(
+                "The result of the function is not the result awaited. "
+                f"The function returned {self.answer} instead of {self.sol}"
+            )
+        if self.over_memory:
+            failures.append(f"The function used {self.memory.peak:.1f}MB, above its budget of {self.max_mb}MB")
+        if self.over_budget and strict():
+            failures.append(self.budget_message)
+        return failures
+
+    @property
+    def budget_message(self) -> str:
+        return f"The function took {self.execution_time:.5f}s, above its budget of {self.budget}s"
+
+
+def strict() -> bool:
+    """Whether the checks are strict, from `AOC_STRICT`: then exceeding a time budget fails the part."""
+    return os.environ.get("AOC_STRICT", "") not in ("", "0")
+
+
+def _date_of(path: Path) -> tuple[int, int]:
+    """Year and day of a solution file following the `{year}/{day}.py` layout."""
+    return int(path.parent.name), int(path.stem)
+
+
+def _section(
+    part: int, sol: Optional[int] = None, max_mb: Optional[float] = None,
+    budget: Optional[float] = None, timeout: Optional[float] = None, variant: Optional[str] = None
+):
     """Section decorator to handle result printing and time execution.
     Part of the section has to be provided for printing reasons.
-    A solution can also be provided to verify the output of the function (usefull in case of refactor)."""
+    A solution can also be provided to verify the output of the function (usefull in case of refactor).
+    In benchmark mode (see `aoc.bench`), the part is run several times and the median time is reported.
+    The timings of the phases of the part (see `aoc.phase`) are reported as well, from its last run.
+    In profiling mode (see `aoc.profiling`), the execution is profiled and the profiles are written to files.
+    The memory used can be tracked as well (see `aoc.memory`), and a budget in MB given to fail the part beyond it.
+    A time `budget` in seconds warns when exceeded, or fails the part in strict mode (see `strict`).
+    With a `timeout` in seconds, the part is executed in a child process, killed if it exceeds the timeout.
+    Alternative implementations of a part are named by a `variant`: they are left out of the year runner,
+    and compared with the default one by `python -m aoc race 2024 6` (see `aoc.race`).
+    The decorated function exposes `execute` to run the part without checking nor printing,
+    which is what the year runner relies on, and `report` to check and print a result."""
 
     def decorator(part_fn: Callable):
-        def wrapper(*args) -> None:
+        # the date is taken from the file defining the part, so it works when imported as well
+        source = Path(part_fn.__code__.co_filename)
+
+        def execute_here() -> Result:
+            context = Context(*_date_of(source))
+            token = _context.set(context)
+            repetitions, warmup = modes.benchmark()
+            profiler = profiling.profile(context.year, context.day, part) if modes.profiling() else nullcontext()
+            tracker = memory.track() if modes.memory() or max_mb is not None else None
+
+            def run() -> Any:
+                context.reset_phases()
+                return part_fn()
 
-            # execute section with time recording
-            t0 = time()
-            result = part_fn()
-            execution_time = time() - t0
+            try:
+                # execute section with time recording
+                with profiler, tracker or nullcontext():
+                    if repetitions:
+                        answer, stats = bench.repeat(run, repetitions, warmup)
+                        execution_time = stats.median
+                    else:
+                        t0 = perf_counter_ns()
+                        answer, stats = run(), None
+                        execution_time = (perf_counter_ns() - t0) / 1e9
+            finally:
+                _context.reset(token)
+            return Result(
+                context.year, context.day, part, answer, execution_time, sol, stats=stats,
+                source=source, inputs=context.inputs, phases=context.phases if context.phases.children else None,
+                memory=tracker and tracker.memory, max_mb=max_mb, budget=budget, variant=variant
+            )
 
-            # check the result if a solution is given
-            if sol is not None and result != sol:
-                raise ValueError(
-                    "The result of the function is not the result awaited."
-                    f"The function returned {result} instead of {sol}"
-                )
+        def timed_out() -> Result:
+            year, day = _date_of(source)
+            return Result(
+                year, day, part, None, timeout or 0., sol, error=f"Timeout: stopped after {timeout}s", variant=variant
+            )
 
-            # print the answer and execution time 
-            print_answer(result, int(Path(sys.argv[0]).stem), part, execution_time)
+        def execute() -> Result:
+            if timeout is None:
+                return execute_here()
+            from .isolation import run_isolated  # pylint: disable=import-outside-toplevel  # circular import
+            return run_isolated(source, part, timeout, variant) or timed_out()
 
+        def report(result: Result) -> Result:
+            # print the answer and execution time, or report them as set by `AOC_OUTPUT` (see `aoc.report`),
+            # before raising below so that a failed part still has its record
+            from .report import reporter  # pylint: disable=import-outside-toplevel  # circular import
+            reporter().part(result)
+            if result.stats:  # only the benchmark mode is recorded (see `bench.recorded`)
+                bench.record([result])
+
+            if result.error:
+                raise TimeoutError(result.error)
+            # check the result if a solution is given, and the memory and time if budgets are given
+            if failures := result.failures:
+                raise ValueError("\n".join(failures))
+            if result.over_budget:
+                warnings.warn(result.budget_message, stacklevel=2)
+            return result
+
+        def wrapper(*args) -> Result:
+            return report(execute())
+
+        wrapper.execute = execute  # type: ignore
+        wrapper.execute_here = execute_here  # type: ignore
+        wrapper.timed_out = timed_out  # type: ignore
+        wrapper.report = report  # type: ignore
+        wrapper.source = source  # type: ignore
+        wrapper.part = part  # type: ignore
+        wrapper.sol = sol  # type: ignore
+        wrapper.max_mb = max_mb  # type: ignore
+        wrapper.budget = budget  # type: ignore
+        wrapper.timeout = timeout  # type: ignore
+        wrapper.variant = variant  # type: ignore
         return wrapper
     return decorator
 
@@ -41,71 +210,185 @@ class section:
     p2 = partial(_section, part=2)
 
 
+def run_day() -> list[Result]:
+    """Run the parts of the running script concurrently, each in its own process, and report them in order.
+    The latency of the day is then roughly the one of its slowest part. To be called in the main block:
+
+        if __name__ == "__main__":
+            run_day()
+
+    The input is loaded beforehand, so that it is downloaded once and, where processes are forked,
+    shared with them through the cache of `load_input`. The timeouts of the parts still apply."""
+    from . import isolation  # pylint: disable=import-outside-toplevel  # circular import
+    from .runner import parts_of  # pylint: disable=import-outside-toplevel  # circular import
+
+    parts = parts_of(sys.modules["__main__"])
+    load_input()
+    t0 = perf_counter_ns()
+    started = [isolation.start(fn.source, fn.part) for fn in parts]
+    results = []
+    try:
+        for fn, (process, receiver) in zip(parts, started):
+            elapsed = (perf_counter_ns() - t0) / 1e9
+            timeout = None if fn.timeout is None else max(0., fn.timeout - elapsed)
+            results.append(fn.report(isolation.wait(process, receiver, timeout) or fn.timed_out()))
+    finally:
+        for process, _ in started[len(results):]:  # a part failed, stop the others
+            isolation.kill(process)
+            process.join()
+    return results
+
+
+@dataclass(frozen=True)
+class RawInput:
+    """Raw bytes of an input, along with the offsets of the start of its lines.
+    The last offset is a sentinel, one byte after the end of the last line, as if it ended with a newline.
+    Lines are memoryviews: no copy of the data is made."""
+    data: memoryview | mmap.mmap
+    offsets: array
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def line(self, i: int) -> memoryview:
+        """Line `i` of the input, without its end of line."""
+        return memoryview(self.data)[self.offsets[i]:self.offsets[i + 1] - 1]
+
+    def __iter__(self):
+        return (self.line(i) for i in range(len(self)))
+
+
+@overload
+def load_input(
+    day: Optional[int]=None, year: Optional[int]=None,
+    path: Optional[Path] = None, test: bool = False, mode: Literal["lines"]="lines"
+) -> tuple[str, ...]: ...
+@overload
 def load_input(
     day: Optional[int]=None, year: Optional[int]=None,
-    path: Optional[Path] = None, test: bool = False
-) -> list[str]:
+    path: Optional[Path] = None, test: bool = False, *, mode: Literal["bytes", "mmap"]
+) -> RawInput: ...
+@overload
+def load_input(
+    day: Optional[int]=None, year: Optional[int]=None,
+    path: Optional[Path] = None, test: bool = False, *, mode: Literal["stream"]
+) -> Iterator[str]: ...
+def load_input(
+    day: Optional[int]=None, year: Optional[int]=None,
+    path: Optional[Path] = None, test: bool = False, mode: str = "lines"
+) -> tuple[str, ...] | RawInput | Iterator[str]:
     """Load the data of the day stored in the path `./{year}/inputs/{day}.txt`.
     the day and the year can be automatically determined from the path of the script and can be omitted.
     - If the file doesn't exist, it will requests the input from advent of code.
     For this case, a session cookie has to be saved in a file '.session' for this function to work.
-    - If a path is given, the function will try to load the file instead.
-    - If `test` is set to True, the function will load the data in `inputs/test.txt` instead."""
+    - If a path is given (or set in `AOC_INPUT`), the function will try to load the file instead.
+    - If `test` is set to True, the function will load the data in `inputs/test.txt` instead.
+    The data is cached until the file changes, thus it is returned immutable:
+    - `mode="lines"` (default): a tuple of lines.
+    - `mode="bytes"` or `mode="mmap"`: a `RawInput`, holding the raw bytes (read in memory or memory-mapped)
+    and the offsets of the lines. It avoids building a `str` per line on big inputs.
+    - `mode="stream"`: an iterator reading the lines lazily, for single-pass solutions on inputs too big
+    to be held in memory (not cached). See `aoc.itertools.iter_blocks` for inputs made of blocks."""
 
-    # retrieve day and path if not provided
+    # retrieve day and path if not provided, from the running part or else from the script
     script_path = Path(sys.argv[0])
-    day_ = day or int(script_path.stem)
-    year_ = year or int(script_path.parent.name)
+    context = _context.get()
+    day_ = day or (context and context.day) or int(script_path.stem)
+    year_ = year or (context and context.year) or int(script_path.parent.name)
 
-    # build input path
+    # build input path, the input can be replaced through `AOC_INPUT` (e.g. by a generated one, see `aoc.gen`)
+    path = path or os.environ.get("AOC_INPUT") or None
     path_ = Path(path or f"./{year_}/inputs/{day_}.txt").resolve()
 
     # test mode: make sure the test file exists
     if test:
         path_ = path_.parent / 'test.txt'
-        path_.touch(exist_ok=True)
+        if not path_.exists():  # touching an existing file would invalidate the cache
+            path_.touch()
 
     # download input if the file doesn't exists
     if not path_.exists() and path is None:
         path_.parent.mkdir(exist_ok=True, parents=True)
         download_input(day_, year_, path_)
 
-    # return input as a list of lines
-    return path_.read_text().splitlines()
+    # keep track of the inputs read by the running part
+    if context and path_ not in context.inputs:
+        context.inputs.append(path_)
+
+    # return input as lines or raw bytes
+    stat = path_.stat()
+    match mode:
+        case "lines": return _read_lines(path_, stat.st_mtime_ns, stat.st_size)
+        case "bytes" | "mmap": return _read_raw(path_, mode, stat.st_mtime_ns, stat.st_size)
+        case "stream": return _stream_lines(path_)
+        case _: raise ValueError(f"mode {mode} is not valid. Please enter 'lines', 'bytes', 'mmap' or 'stream'.")
+
+
+@lru_cache(maxsize=64)
+def _read_lines(path: Path, mtime: int, size: int) -> tuple[str, ...]:  # pylint: disable=unused-argument
+    """Lines of a file. The modification time and the size are part of the cache key,
+    so that the file is read again only when it changes."""
+    return tuple(path.read_text().splitlines())
+
+
+def _stream_lines(path: Path, buffer_size: int = 2 ** 16) -> Iterator[str]:
+    """Lines of a file read lazily through a buffer, so that the memory is bounded by the longest line."""
+    with open(path, encoding="utf-8", buffering=buffer_size) as file:
+        for line in file:
+            yield line.removesuffix("\n")
+
+
+@lru_cache(maxsize=64)
+def _read_raw(path: Path, mode: str, mtime: int, size: int) -> RawInput:  # pylint: disable=unused-argument
+    """Raw bytes of a file, read or memory-mapped, and the offsets of its lines. Cached as `_read_lines`."""
+    if mode == "mmap" and size:  # empty files can't be mapped
+        with open(path, "rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    else:
+        data = memoryview(path.read_bytes())
+
+    offsets = array("q", [0])
+    offsets.extend(m.end() for m in re.finditer(b"\n", data))
+    if offsets[-1] != len(data):  # no end of line at the end of the file
+        offsets.append(len(data) + 1)
+    return RawInput(data, offsets)
 
 
 def download_input(day: int, year: int, output_path: Path, cookie: Optional[Path]=None) -> None:
     """Download the input for the given `day` and `year` and write it in the `output_file` file.
-    Requires the path to a cookie to be able to download it, default is the `.session` file."""
+    Requires the path to a cookie to be able to download it, default is the `.session` file.
+    To download all the missing inputs of a year at once, see `aoc.fetch`."""
 
-    cookie_ = cookie or Path(".session")
-    if not cookie_.exists():
-        raise FileNotFoundError("Cookie `.session` not found, can't download the input.")
-
-    # downloading file
     print(f"downloading input from day {day} of year {year}...")
-    session = cookie_.read_text(encoding='utf-8')
-    response = requests.get(
-        f"https://adventofcode.com/{year}/day/{day}/input",
-        headers={"User-Agent": "clem.laroudie@gmail.com"},
-        cookies={"session": session}, timeout=1
-    )
-    if response.status_code != 200:
-        raise requests.ConnectionError(response=response)
-
-    # write result to file
-    output_path.write_text(response.text, encoding='utf-8')
+    with fetch.make_session(cookie) as session:
+        fetch.fetch_input(session, day, year, output_path)
 
 
-def print_answer(answer, day: int, part: int, execution_time: Optional[float]=None) -> None:
+def print_answer(
+    answer, day: int, part: int,
+    execution_time: Optional[float]=None, stats: Optional[bench.Stats]=None, phases: Optional[Phase]=None,
+    memory: Optional[Memory]=None, variant: Optional[str]=None
+) -> None:
     """Prettier print of the answer. Needs information about the day and the part.
-    The execution time can also be provided."""
+    The execution time can also be provided, or the statistics of a benchmark, the phases' breakdown,
+    the memory used and the variant of the part.
+    The output is written at once, so that it doesn't interleave with the outputs of other processes."""
 
-    print("=" * 50)
-    print(f"[DAY {day}] Answer to part {part} is:\t{answer}")
-    if execution_time:
-        print(f"\nExecution time: {execution_time:.5f}s", end="")
-    print("\n", "=" * 50, sep="")
+    buffer = io.StringIO()
+    out = partial(print, file=buffer)
+    out("=" * 50)
+    out(f"[DAY {day}] Answer to part {part}{f' ({variant})' if variant else ''} is:\t{answer}")
+    if stats:
+        out(f"\nExecution time: {stats}", end="")
+    elif execution_time:
+        out(f"\nExecution time: {execution_time:.5f}s", end="")
+    if phases:
+        out("", *phases.tree(execution_time or 0.), sep="\n", end="")
+    if memory:
+        out(f"\nMemory: {memory}", *(f"- {site}" for site in memory.top), sep="\n", end="")
+    out("\n", "=" * 50, sep="")
+    sys.stdout.write(buffer.getvalue())
+    sys.stdout.flush()
 
 #
 #  Types
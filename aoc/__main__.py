@@ -0,0 +1,123 @@
+"""Command line interface of the `aoc` package, to be run from the root directory.
+
+    python -m aoc run 2024 [days...] [--bench N] [--profile] [--memory] [--force] [--timeout S]
+    python -m aoc bench [2024 [days...]] [--compare] [--scale 1,2,4,8] [--timeout S]
+    python -m aoc race 2024 6 [-n N]
+    python -m aoc startup 2024 [days...]
+    python -m aoc fetch 2024 [days...]
+"""
+import argparse
+import os
+import sys
+
+from . import bench, fetch, race, report, runner, scaling, startup
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m aoc", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="run the parts of a year in parallel and print a table of the answers")
+    run.add_argument("year", type=int)
+    run.add_argument("days", type=int, nargs="*", help="days to run, defaults to all the days found")
+    run.add_argument("-j", "--jobs", type=int, default=None, help="number of processes, defaults to the cpu count")
+    run.add_argument("--bench", type=int, metavar="N", help="benchmark mode: run each part N times (see aoc.bench)")
+    run.add_argument("--warmup", type=int, metavar="W", help="number of warmup runs in benchmark mode, defaults to 1")
+    run.add_argument("--profile", action="store_true", help="profile each part in profiles/ (see aoc.profiling)")
+    run.add_argument("--memory", action="store_true", help="track the memory used by each part (see aoc.memory)")
+    run.add_argument("--strict", action="store_true", help="fail the parts exceeding their time budget")
+    run.add_argument("--force", action="store_true", help="run again the parts unchanged since their last run")
+    run.add_argument("--timeout", type=float, metavar="S",
+                     help="seconds before stopping a legacy day, defaults to 300, 0 to disable (see aoc.legacy)")
+
+    bench_ = commands.add_parser("bench", help="benchmark a year and/or compare the history with the baselines")
+    bench_.add_argument("year", type=int, nargs="?", help="year to benchmark, nothing is run if omitted")
+    bench_.add_argument("days", type=int, nargs="*", help="days to benchmark, defaults to all the days found")
+    bench_.add_argument("-n", type=int, default=10, help="number of runs of each part, defaults to 10")
+    bench_.add_argument("-j", "--jobs", type=int, default=1, help="number of processes, defaults to 1 for steady timings")
+    bench_.add_argument("--compare", action="store_true", help="flag the parts slower than their baseline")
+    bench_.add_argument("--ratio", type=float, default=1.2, help="slowdown ratio flagged, defaults to 1.2")
+    bench_.add_argument("--window", type=int, default=5, help="number of previous runs of the baseline, defaults to 5")
+    bench_.add_argument("--scale", type=lambda s: [float(x) for x in s.split(",")], metavar="1,2,4,8",
+                        help="benchmark on inputs generated at these scales and fit the complexity (see aoc.scaling)")
+    bench_.add_argument("--timeout", type=float, metavar="S",
+                        help="seconds before stopping a legacy day, defaults to 300, 0 to disable (see aoc.legacy)")
+
+    race_ = commands.add_parser("race", help="race the implementations of the parts of a day against each other")
+    race_.add_argument("year", type=int)
+    race_.add_argument("day", type=int)
+    race_.add_argument("-n", type=int, default=10, help="number of runs of each implementation, defaults to 10")
+
+    startup_ = commands.add_parser("startup", help="measure the time from the interpreter launch to the first answer")
+    startup_.add_argument("year", type=int)
+    startup_.add_argument("days", type=int, nargs="*", help="days to measure, defaults to all the days found")
+    startup_.add_argument("-n", type=int, default=3, help="number of launches of each day, the fastest is kept")
+
+    fetch_ = commands.add_parser("fetch", help="download the missing inputs of a year")
+    fetch_.add_argument("year", type=int)
+    fetch_.add_argument("days", type=int, nargs="*", help="days to download, defaults to all the released days")
+    fetch_.add_argument("-j", "--jobs", type=int, default=4, help="number of concurrent requests, defaults to 4")
+    fetch_.add_argument("--interval", type=float, default=1., help="seconds between two requests, defaults to 1")
+
+    args = parser.parse_args(argv)
+    if getattr(args, "timeout", None) is not None:
+        os.environ["AOC_TIMEOUT"] = str(args.timeout)
+    match args.command:
+        case "run":
+            # the benchmark and profiling modes are configured through the environment, inherited by the workers
+            if args.profile:
+                os.environ["AOC_PROFILE"] = "1"
+            if args.memory:
+                os.environ["AOC_MEMORY"] = "1"
+            if args.strict:
+                os.environ["AOC_STRICT"] = "1"
+            if args.bench:
+                os.environ["AOC_BENCH"] = str(args.bench)
+            if args.warmup is not None:
+                os.environ["AOC_WARMUP"] = str(args.warmup)
+            results = runner.run(args.year, args.days, args.jobs, args.force)
+            report.reporter().run(results)
+            # non zero exit code for scripts when a part failed
+            if runner.failures(results):
+                sys.exit(1)
+        case "bench":
+            if args.year is None and not args.compare:
+                parser.error("bench needs a year to run and/or --compare")
+            if args.scale:
+                if args.year is None:
+                    parser.error("bench --scale needs a year")
+                results = scaling.scaling(args.year, args.days, args.scale, args.n)
+                scaling.print_table(results, args.scale)
+                for path in scaling.plot(results):
+                    print(f"plot written in {path}")
+            elif args.year is not None:
+                os.environ["AOC_BENCH"] = str(args.n)
+                # a benchmark measures, it never reuses previous results
+                report.reporter().run(runner.run(args.year, args.days, args.jobs, force=True))
+            if args.compare:
+                history = bench.load_history()
+                if args.year is not None:
+                    history = [e for e in history if e["year"] == args.year and (not args.days or e["day"] in args.days)]
+                comparison = bench.compare(history, args.window)
+                bench.print_comparison(comparison, args.ratio)
+                # non zero exit code for scripts when a part got slower
+                if any(c.ratio > args.ratio for c in comparison):
+                    sys.exit(1)
+        case "race":
+            results = race.race(args.year, args.day, args.n)
+            race.print_race(results)
+            # non zero exit code for scripts when an implementation disagrees
+            if race.disagreements(results):
+                sys.exit(1)
+        case "startup":
+            startup.print_table(startup.startup(args.year, args.days, args.n))
+        case "fetch":
+            status = fetch.fetch(args.year, args.days, args.jobs, args.interval)
+            fetch.print_status(args.year, status)
+            if any(s.startswith("failed") for s in status.values()):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
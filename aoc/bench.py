@@ -0,0 +1,161 @@
+"""Benchmark mode of the decorated parts: repeated timings and their statistics.
+Enabled by setting `AOC_BENCH` to the number of repetitions (and optionally `AOC_WARMUP`),
+e.g. `AOC_BENCH=20 python 2024/1.py` or `python -m aoc run 2024 --bench 20`.
+
+The timings of the benchmark mode are also appended to a history (JSON lines, `AOC_HISTORY`), which is used
+to detect the parts that got slower than their rolling baseline: `python -m aoc bench --compare`."""
+from __future__ import annotations
+from collections import defaultdict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, TYPE_CHECKING
+import hashlib
+import json
+import os
+import platform
+import statistics
+
+from . import profiling
+from .cache import STATE
+from .modes import benchmark as config
+
+if TYPE_CHECKING:
+    from . import Result
+
+
+@dataclass
+class Stats:
+    """Statistics over repeated runs of a part, in seconds."""
+    runs: int
+    min: float
+    median: float
+    p95: float
+    stddev: float
+
+    @classmethod
+    def of(cls, timings_ns: list[int]) -> Stats:
+        timings = [t / 1e9 for t in timings_ns]
+        p95 = statistics.quantiles(timings, n=20, method="inclusive")[-1] if len(timings) > 1 else timings[0]
+        return cls(len(timings), min(timings), statistics.median(timings), p95, statistics.pstdev(timings))
+
+    def __str__(self) -> str:
+        return (f"min {self.min:.5f}s | median {self.median:.5f}s | p95 {self.p95:.5f}s"
+                f" | stddev {self.stddev:.5f}s ({self.runs} runs)")
+
+
+def repeat(fn: Callable[[], Any], repetitions: int, warmup: int = 1) -> tuple[Any, Stats]:
+    """Run a function `warmup` times, then `repetitions` times with time recording.
+    Warmup runs absorb first call costs (imports, page faults, regex compilation...).
+    All the runs have to agree on the answer, which is returned along with the statistics."""
+    answers = [fn() for _ in range(warmup)]
+    timings = []
+    for _ in range(repetitions):
+        t0 = perf_counter_ns()
+        answers.append(fn())
+        timings.append(perf_counter_ns() - t0)
+
+    if any(a != answers[0] for a in answers):
+        raise ValueError(f"The function is not deterministic, it returned: {set(map(str, answers))}")
+    return answers[-1], Stats.of(timings)
+
+
+#
+#  History
+#
+
+def history_path() -> Path | None:
+    """Path of the history, from `AOC_HISTORY` (default `.aoc/history.jsonl` at the root of the repository).
+    Set it to an empty string to disable the history."""
+    path = os.environ.get("AOC_HISTORY", str(STATE / "history.jsonl"))
+    return Path(path) if path else None
+
+
+def file_hash(*paths: Path) -> str:
+    """Short hash of the content of some files."""
+    h = hashlib.sha256()
+    for path in paths:
+        h.update(path.read_bytes())
+    return h.hexdigest()[:16]
+
+
+def recorded(result: Result) -> bool:
+    """Whether a result belongs to the history: only the timings of the benchmark mode are comparable,
+    without the overhead of the profiling or of the memory tracking. Parts that failed are ignored, as the variants
+    of a part (they are compared with the default implementation by `aoc.race`, not with a baseline)."""
+    return result.stats is not None and result.memory is None and not result.error and result.variant is None
+
+
+def record(results: Iterable[Result]) -> None:
+    """Append the timings of the results of the benchmark mode to the history, see `recorded`."""
+    if (path := history_path()) is None or profiling.enabled():
+        return
+    entries = [{
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "year": r.year, "day": r.day, "part": r.part,
+        "source": file_hash(r.source) if r.source else None,
+        "input": file_hash(*r.inputs) if r.inputs else None,
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "mode": "bench",
+        "time": r.execution_time,
+        "runs": r.stats.runs,
+        "verified": r.verified,
+    } for r in results if recorded(r)]
+    if not entries:
+        return
+    path.parent.mkdir(exist_ok=True, parents=True)
+    with open(path, "a", encoding="utf-8") as file:
+        file.write("".join(json.dumps(e) + "\n" for e in entries))
+
+
+def load_history() -> list[dict]:
+    """All the entries of the history, from the oldest to the newest."""
+    path = history_path()
+    if path is None or not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines() if line]
+
+
+@dataclass
+class Regression:
+    """Comparison of the latest timing of a part with the median of the previous ones."""
+    year: int
+    day: int
+    part: int
+    time: float
+    baseline: float
+
+    @property
+    def ratio(self) -> float:
+        return self.time / self.baseline if self.baseline else float("inf")
+
+
+def compare(history: list[dict], window: int = 5) -> list[Regression]:
+    """Compare the latest entry of each part with its rolling baseline: the median of the `window`
+    previous entries. Only the timings of the benchmark mode made on the same input and with the same interpreter
+    are compared: the entries written before the mode was recorded mix single runs and instrumented runs."""
+    history = [e for e in history if e.get("mode") == "bench"]
+    groups = defaultdict(list)
+    for e in history:
+        groups[e["year"], e["day"], e["part"], e["input"], e["python"]].append(e["time"])
+
+    # only keep the latest input and interpreter of each part
+    latest = {(e["year"], e["day"], e["part"]): (e["input"], e["python"]) for e in history}
+    return [
+        Regression(*key, times[-1], statistics.median(times[-window-1:-1]))
+        for key, (input_, python) in sorted(latest.items())
+        if len(times := groups[*key, input_, python]) > 1
+    ]
+
+
+def print_comparison(comparison: list[Regression], ratio: float) -> None:
+    """Print the comparison with the baselines, flagging the parts slower than `ratio` times their baseline."""
+    print(f"{'year':>4} {'day':>3} {'part':>4}  {'time':>10} {'baseline':>10} {'ratio':>6}")
+    print("-" * 52)
+    for c in comparison:
+        flag = "  SLOWER" if c.ratio > ratio else ""
+        print(f"{c.year:>4} {c.day:>3} {c.part:>4}  {c.time:>9.5f}s {c.baseline:>9.5f}s {c.ratio:>6.2f}{flag}")
+    print("-" * 52)
+    print(f"{sum(c.ratio > ratio for c in comparison)} parts slower than {ratio} times their baseline")
@@ -0,0 +1,84 @@
+"""Cache of parsed inputs across runs.
+Files are stored in the directory `AOC_CACHE` (default `.aoc/cache` at the root of the repository),
+set it to an empty string to disable the cache."""
+from collections.abc import Callable
+from functools import wraps
+from pathlib import Path
+from typing import Any
+import hashlib
+import marshal
+import os
+import pickle
+import sys
+import tempfile
+
+# the local state of the package, at the root of the repository whatever the directory the days are run from
+STATE = Path(__file__).resolve().parent.parent / ".aoc"
+# number of entries kept for each parser, the least recently used are evicted
+ENTRIES = 4
+
+
+def cache_dir() -> Path | None:
+    """Directory of the cache, None if disabled."""
+    path = os.environ.get("AOC_CACHE", str(STATE / "cache"))
+    return Path(path) if path else None
+
+
+def _digest(*objects: Any) -> str:
+    """Hash of some objects, serialized with marshal when possible (fast) or pickle otherwise."""
+    try:
+        data = marshal.dumps(objects)
+    except ValueError:
+        data = pickle.dumps(objects)
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write a file through a temporary file, so that it is never seen partially written."""
+    path.parent.mkdir(exist_ok=True, parents=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _evict(directory: Path, name: str) -> None:
+    """Remove the least recently used results of a parser beyond the `ENTRIES` most recent ones."""
+    try:
+        entries = sorted(directory.glob(f"{name}-*.pickle"), key=lambda p: p.stat().st_mtime, reverse=True)
+    except FileNotFoundError:
+        return  # evicted meanwhile by another process
+    for path in entries[ENTRIES:]:
+        path.unlink(missing_ok=True)
+
+
+def cached_parse(parser: Callable) -> Callable:
+    """Decorator caching the result of a parser on disk, as a pickle.
+    The key is made of the arguments (the input) and of the bytecode of the parser, so that
+    the cache is invalidated when either changes. Helpers called by the parser are not part of the key.
+    The result is loaded again at each call, thus it can be mutated freely.
+    Only the `ENTRIES` most recently used results of each parser are kept."""
+
+    @wraps(parser)
+    def wrapper(*args, **kwargs):
+        if (directory := cache_dir()) is None:
+            return parser(*args, **kwargs)
+
+        # the module is part of the name as pickles refer to the classes through it
+        key = _digest(marshal.dumps(parser.__code__), sys.version, args, kwargs)
+        name = f"{parser.__module__}.{parser.__qualname__}"
+        path = directory / "parse" / f"{name}-{key}.pickle"
+        if path.exists():
+            os.utime(path)  # the modification time tracks the last use
+            return pickle.loads(path.read_bytes())
+
+        result = parser(*args, **kwargs)
+        write_atomic(path, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+        _evict(path.parent, name)
+        return result
+
+    return wrapper
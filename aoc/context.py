@@ -0,0 +1,79 @@
+"""State of the part being executed by `section`, shared with the helpers it calls.
+It also collects the timings of the phases of a part:
+
+    with phase("parse"):
+        data = parse(load_input())
+
+Phases can be nested and used as decorators. Outside of a part, they do nothing."""
+from __future__ import annotations
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Optional
+
+
+@dataclass
+class Phase:
+    """Time spent in a phase, accumulated over the times it is entered, and its sub-phases."""
+    name: str
+    time: float = 0.
+    count: int = 0
+    children: dict[str, Phase] = field(default_factory=dict)
+    _start: int = field(default=0, repr=False)
+
+    def tree(self, total: float, indent: int = 0) -> list[str]:
+        """Lines describing the sub-phases, with their share of the `total` time."""
+        lines = []
+        for c in self.children.values():
+            count = f" (x{c.count})" if c.count > 1 else ""
+            share = f" ({c.time / total:.0%})" if total else ""
+            lines.append(f"{'  ' * indent}- {c.name}: {c.time:.5f}s{share}{count}")
+            lines += c.tree(total, indent + 1)
+        return lines
+
+
+@dataclass
+class Context:
+    """State of a running part: `load_input` uses its date instead of the script path
+    and registers the files it reads, `phase` records its timings in the phase tree."""
+    year: int
+    day: int
+    inputs: list[Path] = field(default_factory=list)
+    phases: Phase = field(default_factory=lambda: Phase("part"))
+    stack: list[Phase] = field(default_factory=list)
+
+    def reset_phases(self) -> None:
+        """Start a new phase tree, for a new run of the part."""
+        self.phases = Phase("part")
+        self.stack = [self.phases]
+
+
+current: ContextVar[Optional[Context]] = ContextVar("context", default=None)
+
+
+class phase(ContextDecorator):
+    """Context manager (or decorator) timing a phase of the running part.
+    Phases with the same name and parent are merged. Not meant for recursive functions."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+
+    def __enter__(self) -> phase:
+        if (context := current.get()) is None or not context.stack:
+            return self
+        parent = context.stack[-1]
+        if (p := parent.children.get(self.name)) is None:
+            p = parent.children[self.name] = Phase(self.name)
+        context.stack.append(p)
+        p._start = perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        t = perf_counter_ns()
+        if (context := current.get()) is None or len(context.stack) < 2:
+            return
+        p = context.stack.pop()
+        p.time += (t - p._start) / 1e9
+        p.count += 1
@@ -0,0 +1,143 @@
+"""Download of the inputs through a single keep-alive session, with retries and rate limiting.
+Used by `load_input` for a missing input, and to fetch all the missing inputs of a year at once:
+
+    python -m aoc fetch 2024 [days...]
+
+The server can be changed with `AOC_URL` (e.g. a local stand-in server for testing)."""
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Optional
+import os
+import threading
+
+from .cache import write_atomic
+from .lazy import lazy_import
+
+requests = lazy_import("requests")
+
+USER_AGENT = "clem.laroudie@gmail.com"
+RETRY_STATUS = (429, 500, 502, 503, 504)
+RETRY_AFTER_STATUS = (429, 503)
+
+
+def base_url() -> str:
+    return os.environ.get("AOC_URL", "https://adventofcode.com").rstrip("/")
+
+
+class RateLimiter:
+    """Ensure a minimal interval between the requests, shared by all the threads."""
+
+    def __init__(self, interval: float) -> None:
+        self.interval, self._next = interval, 0.
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        sleep(start - now)
+
+
+def make_session(cookie: Optional[Path] = None, pool_size: int = 4):
+    """Session authenticated with the cookie saved in `cookie`, default is the `.session` file.
+    Its connections are kept alive and reused by the successive requests."""
+    cookie_ = cookie or Path(".session")
+    if not cookie_.exists():
+        raise FileNotFoundError("Cookie `.session` not found, can't download the input.")
+
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    session.cookies.set("session", cookie_.read_text(encoding='utf-8').strip())
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def retry_after(response) -> Optional[float]:
+    """Seconds to wait before retrying, as asked by the `Retry-After` header of a 429 or 503 response:
+    a number of seconds or a date. None if not given or not valid."""
+    value = response.headers.get("Retry-After")
+    if response.status_code not in RETRY_AFTER_STATUS or value is None:
+        return None
+    try:
+        return max(0., float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0., (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def fetch_input(
+    session, day: int, year: int, output_path: Path,
+    retries: int = 3, backoff: float = 1., limiter: Optional[RateLimiter] = None, timeout: float = 10.
+) -> None:
+    """Download the input of a day and write it atomically in `output_path`.
+    Connection errors and server errors are retried `retries` times, with an exponential backoff,
+    or after the delay asked by the server (`Retry-After`) when rate limited or unavailable."""
+    url = f"{base_url()}/{year}/day/{day}/input"
+    for attempt in range(retries + 1):
+        if limiter:
+            limiter.wait()
+        delay = backoff * 2 ** attempt
+        try:
+            response = session.get(url, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error: Exception = e
+        else:
+            if response.status_code == 200:
+                write_atomic(output_path, response.content)
+                return
+            error = requests.HTTPError(f"{response.status_code} {response.reason} for {url}", response=response)
+            if response.status_code not in RETRY_STATUS:
+                raise error
+            if (asked := retry_after(response)) is not None:
+                delay = asked
+        if attempt < retries:
+            sleep(delay)
+    raise error
+
+
+def released_days(year: int) -> list[int]:
+    """Days of a year already released, at midnight EST (UTC-5)."""
+    now = datetime.now(timezone.utc)
+    return [d for d in range(1, 26) if datetime(year, 12, d, 5, tzinfo=timezone.utc) <= now]
+
+
+def fetch(
+    year: int, days: Iterable[int] = (), jobs: int = 4, interval: float = 1.,
+    cookie: Optional[Path] = None
+) -> dict[int, str]:
+    """Download the missing inputs of the given days of a year (default: all the released days)
+    with `jobs` concurrent requests, `interval` seconds apart. Returns the status of each day."""
+    days_ = sorted(days) or released_days(year)
+    paths = {d: Path(f"./{year}/inputs/{d}.txt") for d in days_}
+    status = {d: "present" for d, p in paths.items() if p.exists()}
+    missing = [d for d in days_ if d not in status]
+    if not missing:
+        return status
+
+    session, limiter = make_session(cookie, pool_size=jobs), RateLimiter(interval)
+
+    def task(day: int) -> str:
+        try:
+            fetch_input(session, day, year, paths[day], limiter=limiter)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return f"failed: {e}"
+        return "downloaded"
+
+    with session, ThreadPoolExecutor(max_workers=jobs) as pool:
+        status |= dict(zip(missing, pool.map(task, missing)))
+    return dict(sorted(status.items()))
+
+
+def print_status(year: int, status: dict[int, str]) -> None:
+    for day, s in status.items():
+        print(f"{year} day {day:>2}: {s}")
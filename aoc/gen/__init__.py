@@ -0,0 +1,43 @@
+"""Generators of synthetic inputs, valid for the solutions of a day but scaled up from the size of the real input.
+They are used to measure how the solutions scale: `python -m aoc bench 2024 6 --scale 1,2,4,8` (see `aoc.scaling`).
+
+A generator takes the scale (the size of the input relative to the real one) and a random generator,
+and returns the content of the input. It is registered for a day with `@generator(year, day)`."""
+from collections.abc import Callable
+from pathlib import Path
+from random import Random
+import os
+
+from ..cache import STATE, write_atomic
+
+Generator = Callable[[float, Random], str]
+
+GENERATORS: dict[tuple[int, int], Generator] = {}
+
+
+def generator(year: int, day: int) -> Callable[[Generator], Generator]:
+    """Register the generator of the inputs of a day."""
+    def decorator(fn: Generator) -> Generator:
+        GENERATORS[(year, day)] = fn
+        return fn
+    return decorator
+
+
+def gen_dir() -> Path:
+    """Directory of the generated inputs, from `AOC_GEN` (default `.aoc/gen` at the root of the repository)."""
+    return Path(os.environ.get("AOC_GEN", str(STATE / "gen")))
+
+
+def generate(year: int, day: int, scale: float, seed: int = 0) -> Path:
+    """Path of an input of a day generated at the given scale, generated only if it doesn't exist yet.
+    Inputs are deterministic for a given seed, so that timings are comparable across runs."""
+    if (year, day) not in GENERATORS:
+        raise KeyError(f"No generator for day {day} of year {year}, available: {sorted(GENERATORS)}")
+    path = gen_dir() / str(year) / f"{day}-x{scale:g}-{seed}.txt"
+    if not path.exists():
+        write_atomic(path, GENERATORS[(year, day)](scale, Random(f"{year}-{day}-{seed}")).encode())
+    return path
+
+
+# register the generators
+from . import y2023, y2024  # pylint: disable=wrong-import-position  # noqa: E402
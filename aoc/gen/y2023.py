@@ -0,0 +1,41 @@
+"""Generators of the inputs of 2023."""
+from random import Random
+
+from . import generator
+
+
+@generator(2023, 22)
+def bricks(scale: float, rng: Random) -> str:
+    """About 1200 bricks at scale 1, of 1 to 5 cubes, in a 10x10 column whose height grows with the scale.
+    Bricks don't overlap, as in the snapshot of the puzzle."""
+    n, height = max(1, round(1200 * scale)), max(10, round(300 * scale))
+    occupied, lines = set[tuple[int, int, int]](), []
+    while len(lines) < n:
+        start = [rng.randrange(10), rng.randrange(10), rng.randint(1, height)]
+        end, axis = start.copy(), rng.randrange(3)
+        end[axis] += rng.randrange(5)
+        if end[0] > 9 or end[1] > 9:
+            continue
+        cubes = {tuple(s + (k if i == axis else 0) for i, s in enumerate(start))
+                 for k in range(end[axis] - start[axis] + 1)}
+        if cubes & occupied:
+            continue
+        occupied |= cubes
+        lines.append(f"{','.join(map(str, start))}~{','.join(map(str, end))}")
+    return "".join(line + "\n" for line in lines)
+
+
+@generator(2023, 24)
+def hailstones(scale: float, rng: Random) -> str:
+    """About 300 hailstones at scale 1, all hit by a single rock thrown at integer time and speed.
+    Velocities are small so that some hailstones share a velocity along each axis, as in the puzzle."""
+    n = max(3, round(300 * scale))
+    rock = [rng.randint(int(1e14), int(4e14)) for _ in range(3)]
+    speed = [rng.randint(-200, 200) for _ in range(3)]
+    times = rng.sample(range(int(1e11), int(1e12)), n)
+    lines = []
+    for t in times:
+        v = [s + rng.choice((-1, 1)) * rng.randint(1, 300) for s in speed]  # never the speed of the rock
+        p = [r + (s - u) * t for r, s, u in zip(rock, speed, v)]
+        lines.append(f"{', '.join(map(str, p))} @ {', '.join(map(str, v))}")
+    return "".join(line + "\n" for line in lines)
@@ -0,0 +1,65 @@
+"""Generators of the inputs of 2024. Grids grow in area with the scale, so that their size does."""
+from collections import deque
+from random import Random
+
+from . import generator
+
+
+def _side(side: int, scale: float) -> int:
+    return max(1, round(side * scale ** .5))
+
+
+def _leaves(grid: list[list[str]], start: tuple[int, int]) -> bool:
+    """Whether the guard starting (upward) at `start` leaves the grid, or ends up in a loop."""
+    (i, j), (di, dj), seen = start, (-1, 0), set()
+    while 0 <= i + di < len(grid) and 0 <= j + dj < len(grid[0]):
+        if grid[i + di][j + dj] == "#":
+            if (i, j, di, dj) in seen:
+                return False
+            seen.add((i, j, di, dj))
+            di, dj = dj, -di  # turn right
+        else:
+            i, j = i + di, j + dj
+    return True
+
+
+@generator(2024, 6)
+def guard_lab(scale: float, rng: Random) -> str:
+    """Lab of 130x130 cells at scale 1, with 5% of obstacles and the guard in its center.
+    Layouts where the guard never leaves the lab are drawn again."""
+    side = _side(130, scale)
+    start = (side // 2, side // 2)
+    while True:
+        grid = [["#" if rng.random() < .05 else "." for _ in range(side)] for _ in range(side)]
+        grid[start[0]][start[1]] = "^"
+        if _leaves(grid, start):
+            return "".join("".join(row) + "\n" for row in grid)
+
+
+@generator(2024, 9)
+def disk_map(scale: float, rng: Random) -> str:
+    """Disk map of 20000 digits at scale 1: files of 1 to 9 blocks, separated by 0 to 9 free blocks."""
+    files = max(1, round(10000 * scale))
+    digits = (f"{rng.randint(1, 9)}{rng.randint(0, 9)}" for _ in range(files - 1))
+    return "".join(digits) + f"{rng.randint(1, 9)}\n"
+
+
+@generator(2024, 10)
+def topographic_map(scale: float, rng: Random) -> str:
+    """Map of 45x45 heights at scale 1, made of hills whose height decreases by 1 at each step from their summit,
+    so that they are climbed by hiking trails. Some cells are then set at random to break the trails."""
+    side = _side(45, scale)
+    summits = [(rng.randrange(side), rng.randrange(side)) for _ in range(max(1, side * side // 40))]
+    distance = [[9] * side for _ in range(side)]
+    queue = deque[tuple[int, int]]()
+    for i, j in summits:
+        distance[i][j] = 0
+        queue.append((i, j))
+    while queue:  # breadth first search from all the summits at once
+        i, j = queue.popleft()
+        for k, l in ((i - 1, j), (i + 1, j), (i, j - 1), (i, j + 1)):
+            if 0 <= k < side and 0 <= l < side and distance[i][j] + 1 < distance[k][l]:
+                distance[k][l] = distance[i][j] + 1
+                queue.append((k, l))
+    digits = ("".join(str(rng.randrange(10) if rng.random() < .1 else 9 - d) for d in row) for row in distance)
+    return "".join(row + "\n" for row in digits)
@@ -1,39 +1,284 @@
 from __future__ import annotations
-from collections.abc import Iterator
-from typing import Callable, TypeVar, Self
-from dataclasses import dataclass, field
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from functools import lru_cache
+from typing import Any, Callable, Literal, Optional, TypeVar
 
 from .itertools import crange
+from .lazy import lazy_import
+from .utils import Neighborhood
+
+np = lazy_import("numpy")  # optional, only needed by the numpy backend
 
 Coordinate = tuple[int, int]
 R = TypeVar("R")
 
-@dataclass
+Storage = bytearray | array | list
+Backend = Literal["array", "numpy"]
+Table = bytes | Mapping[str, int]
+
+
+def _storage(values: list) -> Storage:
+    """Most compact storage of the cells of a grid: a `bytearray` for single characters (latin-1),
+    an `array('i')` for integers fitting in a C int, the list itself otherwise."""
+    if all(type(v) is str and len(v) == 1 for v in values):
+        try:
+            return bytearray("".join(values), "latin-1")
+        except UnicodeEncodeError:
+            return values
+    if all(type(v) is int for v in values):
+        try:
+            return array("i", values)
+        except OverflowError:
+            return values
+    return values
+
+
+def translation(mapping: Mapping[str, int]) -> bytes:
+    """Translation table of the 256 bytes for `Grid.from_bytes`, from characters to integers between 0 and 255.
+    The other bytes are left unchanged."""
+    return bytes.maketrans("".join(mapping).encode("latin-1"), bytes(mapping.values()))
+
+
+DIGITS = translation({str(d): d for d in range(10)})
+WALLS = translation({"#": 1, ".": 0})
+
+# characters of the bytes, indexing it is cheaper than calling `chr` in the accessors of the cells
+_CHARS = tuple(map(chr, range(256)))
+
+
+@lru_cache(maxsize=64)
+def adjacency(shape: tuple[int, int], mode: str = "c4") -> tuple[array, array]:
+    """Neighbors of the cells of a grid of a given shape, by their linear index `i * m + j`, as two arrays in CSR
+    format: the neighbors of the cell `k` are `indices[indptr[k]:indptr[k + 1]]`, in the order of
+    `Neighborhood(mode)` and without the ones out of the grid. Computed once per shape and mode.
+
+        indptr, indices = adjacency(grid.shape)
+        for k in range(indptr[cell], indptr[cell + 1]):
+            neighbor = indices[k]"""
+    (n, m), directions = shape, Neighborhood(mode)  # type: ignore
+    indptr, indices = array("i", [0]), array("i")
+    for i in range(n):
+        for j in range(m):
+            indices.extend((i + di) * m + j + dj for di, dj in directions if 0 <= i + di < n and 0 <= j + dj < m)
+            indptr.append(len(indices))
+    return indptr, indices
+
+
 class Grid[S]:
-    _data: list[list[S]] = field(repr=False)
+    """Grid of cells stored in one flat buffer, row after row, with a row stride equal to the number of columns.
+    The storage is as compact as the cells allow (see `_storage`): characters are stored as bytes and read back
+    as `str`. Setting a cell to a value that doesn't fit the storage raises a TypeError, as the storage may be shared
+    with views: `copy(compact=False)` gives a grid stored in a list, where the cells can take any value.
+    Cells are accessed by their coordinates `grid[i, j]` (negative coordinates are out of the grid),
+    or faster in hot loops by their linear index `k = grid.index((i, j))`: `grid.at(k)`, `grid.set_at(k, value)`.
+
+    `T`, `flip`, `rotate90` and `subgrid` return views sharing the storage of the grid, where only the mapping
+    of the coordinates changes: the cell (i, j) is at the index `offset + i * stride + j * step` of the storage.
+    The writes to a view are seen by its grid, and `copy()` gives a grid with a storage of its own.
+    See `NumpyGrid` for a storage in a numpy array, with vectorized operations."""
+    __slots__ = ("_data", "_shape", "_offset", "_stride", "_step", "_chars")
+
+    def __init__(self, data: list[list[S]]) -> None:
+        assert all(len(row) == len(data[0]) for row in data)
+        self._set(_storage([e for row in data for e in row]), (len(data), len(data[0]) if data else 0))
+
+    def _set(
+        self, data: Storage, shape: tuple[int, int], chars: bool | None = None,
+        offset: int = 0, steps: tuple[int, int] | None = None
+    ) -> None:
+        self._data, self._shape = data, shape
+        self._chars = isinstance(data, bytearray) if chars is None else chars
+        self._offset, (self._stride, self._step) = offset, steps or (shape[1], 1)
 
     @classmethod
-    def from_strings(cls, data: list[str]) -> Grid[str]:
-        return cls([list(r) for r in data])  # type: ignore
+    def _of(cls, data: Storage, shape: tuple[int, int]) -> Grid:
+        """Grid over the given cells, compacted if they are given as a list."""
+        grid = cls.__new__(cls)
+        grid._set(_storage(data) if isinstance(data, list) else data, shape)
+        return grid
+
+    def _view(self, shape: tuple[int, int], offset: int, steps: tuple[int, int]) -> Grid[S]:
+        view = type(self).__new__(type(self))
+        view._set(self._data, shape, self._chars, offset, steps)
+        return view
 
-    def __post_init__(self) -> None:
-        assert all(len(self._data[i]) == len(self._data[0]) for i in range(self.shape[0]))
+    @classmethod
+    def from_strings(cls, data: list[str], backend: Backend = "array") -> Grid[str]:
+        """Grid of the characters of the lines, stored in a flat buffer or, with `backend="numpy"`, in a numpy array."""
+        assert all(len(row) == len(data[0]) for row in data)
+        shape = (len(data), len(data[0]) if data else 0)
+        match backend:
+            case "array":
+                try:
+                    return cls._of(bytearray("".join(data), "latin-1"), shape)
+                except UnicodeEncodeError:
+                    return cls._of(list("".join(data)), shape)
+            case "numpy":
+                return NumpyGrid.from_strings(data)
+            case _: raise ValueError(f"backend {backend} is not valid. Please enter 'array' or 'numpy'.")
+
+    @classmethod
+    def from_bytes(cls, buffer: Any, table: Optional[Table] = None, backend: Backend = "array") -> Grid:
+        """Grid of the bytes of an input, one row per line, from any buffer: `bytes`, the data of
+        `load_input(mode="bytes")`, an `mmap`... The cells are translated and the ends of lines dropped in one pass,
+        without building a `str` per cell:
+        - without table, the cells are characters, as with `from_strings`;
+        - with a table of the 256 bytes (`DIGITS`, `WALLS`, see `translation`) or a mapping of characters
+        to integers, the cells are the integers, stored in an `array('B')`."""
+        raw = bytearray(buffer)
+        eol = raw.find(b"\n")
+        m = len(raw) if eol < 0 else eol - (eol > 0 and raw[eol - 1] == ord("\r"))
+        if table is not None and not isinstance(table, bytes):
+            table = translation(table)
+        cells = raw.translate(table, b"\r\n")
+        # every line, up to the trailing ends of lines, has the width of the first one:
+        # the ends of lines are found at regular intervals and the number of cells matches
+        end = len(raw)
+        while end and raw[end - 1] in b"\r\n":
+            end -= 1
+        n = raw.count(b"\n", 0, end) + 1 if end else 0
+        if len(cells) != n * m or (n > 1 and raw[eol:end:eol + 1].count(b"\n") != n - 1):
+            raise ValueError("The lines of the input don't have the same length.")
+        shape = (n, m) if m else (0, 0)
+        match backend:
+            case "array": return cls._of(cells if table is None else array("B", cells), shape)
+            case "numpy": return NumpyGrid._of(np.frombuffer(cells, dtype=np.uint8), shape, chars=table is None)
+            case _: raise ValueError(f"backend {backend} is not valid. Please enter 'array' or 'numpy'.")
+
+    # the accessors are inlined: they are the hot path of most days
 
     def __getitem__(self, idx: Coordinate) -> S:
-        return self._data[idx[0]][idx[1]]
+        i, j = idx
+        n, m = self._shape
+        if 0 <= i < n and 0 <= j < m:
+            value = self._data[self._offset + i * self._stride + j * self._step]
+            return _CHARS[value] if self._chars else value  # type: ignore
+        raise IndexError(f"{idx} is out of the grid of shape {self._shape}")
 
     def __setitem__(self, idx: Coordinate, value: S) -> None:
-        self._data[idx[0]][idx[1]] = value
+        i, j = idx
+        n, m = self._shape
+        if not (0 <= i < n and 0 <= j < m):
+            raise IndexError(f"{idx} is out of the grid of shape {self._shape}")
+        k = self._offset + i * self._stride + j * self._step
+        try:
+            self._data[k] = ord(value) if self._chars else value  # type: ignore
+        except (TypeError, ValueError, OverflowError):
+            self.set_at(k, value)  # doesn't fit the storage
+
+    #
+    #  Linear indices
+    #
+
+    @property
+    def stride(self) -> int:
+        """Distance between the linear indices of two vertically adjacent cells."""
+        return self._stride
+
+    @property
+    def step(self) -> int:
+        """Distance between the linear indices of two horizontally adjacent cells."""
+        return self._step
+
+    def index(self, idx: Coordinate) -> int:
+        """Linear index of a cell."""
+        return self._offset + idx[0] * self._stride + idx[1] * self._step
+
+    def coord(self, k: int) -> Coordinate:
+        """Coordinates of the cell at a linear index."""
+        (n, m), r = self._shape, k - self._offset
+        if self._step == 1 and self._stride >= m:
+            return divmod(r, self._stride)
+        # the axis with the largest step gives the quotient, the other one the remainder of the same sign
+        rows = (abs(self._stride), n) >= (abs(self._step), m)
+        outer, inner = (self._stride, self._step) if rows else (self._step, self._stride)
+        q = (r if inner > 0 else -r) // abs(outer)
+        a = q if (outer > 0) == (inner > 0) else -q
+        b = (r - a * outer) // inner
+        return (a, b) if rows else (b, a)
+
+    def at(self, k: int) -> S:
+        """Cell at a linear index."""
+        value = self._data[k]
+        return _CHARS[value] if self._chars else value  # type: ignore
+
+    def neighbors(self, k: int, mode: str = "c4") -> Sequence[int]:
+        """Linear indices of the neighbors inside the grid of the cell at a linear index, from the tables
+        of `adjacency`. For a view, its indices are converted through the coordinates."""
+        indptr, indices = adjacency(self._shape, mode)
+        if not self.is_view:
+            return indices[indptr[k]:indptr[k + 1]]
+        m = self._shape[1]
+        i, j = self.coord(k)
+        return [self.index(divmod(c, m)) for c in indices[indptr[i * m + j]:indptr[i * m + j + 1]]]
+
+    def set_at(self, k: int, value: S) -> None:
+        """Set the cell at a linear index. A value that doesn't fit the storage raises a TypeError:
+        changing the storage would detach the views of the grid (see `copy(compact=False)`)."""
+        try:
+            self._data[k] = ord(value) if self._chars else value  # type: ignore
+        except (TypeError, ValueError, OverflowError):
+            raise TypeError(f"{value!r} doesn't fit in the storage of the grid, copy(compact=False) it first.") from None
+
+    #
+    #  Whole grid
+    #
+
+    @property
+    def is_view(self) -> bool:
+        """Whether the storage is shared or doesn't hold exactly the cells row after row."""
+        n, m = self._shape
+        return (self._offset, self._stride, self._step) != (0, m, 1) or len(self._data) != n * m
+
+    def _line(self, start: int, step: int, count: int) -> Storage:
+        """`count` values of the storage from `start`, every `step`."""
+        stop = start + count * step
+        return self._data[start:stop if stop >= 0 else None:step]
+
+    def _flat(self) -> Storage:
+        """The cells row after row: the storage itself, or a new one for a view."""
+        if not self.is_view:
+            return self._data
+        data = self._data[0:0]
+        for i in range(self._shape[0]):
+            data += self._line(self._offset + i * self._stride, self._step, self._shape[1])
+        return data
 
     def __iter__(self) -> Iterator[S]:
-        return (e for row in self._data for e in row)
+        data = self._flat()
+        return iter(data.decode("latin-1")) if self._chars else iter(data)  # type: ignore
 
     def __len__(self) -> int:
-        return len(self._data[0])
+        return self._shape[1]
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Grid) and self._shape == other._shape and list(self) == list(other)
+
+    def copy(self, compact: bool = True) -> Grid[S]:
+        """Grid with a storage of its own, holding the cells row after row.
+        With `compact=False`, the storage is a list, where the cells can be set to any value."""
+        if not compact:
+            grid = Grid.__new__(Grid)
+            grid._set(list(self), self._shape)
+            return grid
+        data = self._flat()
+        return type(self)._of(data[:] if data is self._data else data, self._shape)
+
+    def count(self, value: S) -> int:
+        """Number of cells equal to the value."""
+        if not self._chars:
+            return self._flat().count(value)
+        is_byte = isinstance(value, str) and len(value) == 1 and ord(value) < 256
+        return self._flat().count(ord(value)) if is_byte else 0
+
+    def argwhere(self, value: S) -> list[Coordinate]:
+        """Coordinates of the cells equal to the value, row after row."""
+        return [ij for ij, e in self.enumerate() if e == value]
 
     @property
     def shape(self) -> tuple[int, int]:
-        return len(self._data), len(self._data[0])
+        return self._shape
 
     @property
     def T(self) -> Grid[S]:
@@ -41,50 +286,189 @@ class Grid[S]:
 
     @property
     def rows(self) -> Iterator[list[S]]:
-        return iter(self._data)
+        return (self.row(i) for i in range(self._shape[0]))
 
     @property
     def cols(self) -> Iterator[list[S]]:
-        return (self.col(j) for j in range(self.shape[1]))
+        return (self.col(j) for j in range(self._shape[1]))
+
+    def _cells(self, data: Storage) -> list[S]:
+        return list(data.decode("latin-1")) if self._chars else list(data)  # type: ignore
+
+    def row(self, i: int) -> list[S]:
+        return self._cells(self._line(self._offset + i * self._stride, self._step, self._shape[1]))
+
+    def col(self, j: int) -> list[S]:
+        return self._cells(self._line(self._offset + j * self._step, self._stride, self._shape[0]))
 
-    def row(self, i: int) -> list[S]: return self._data[i].copy()
-    def col(self, j: int) -> list[S]: return [self[i,j] for i in range(self.shape[0])]
-    
     def enumerate(self) -> Iterator[tuple[Coordinate, S]]:
-        return ( (ij, self[ij]) for ij in crange(self.shape))
+        return zip(crange(self._shape), self)
 
     def map(self, fn: Callable[[S], R]) -> Grid[R]:
-        return Grid([[ fn(e) for e in row] for row in self._data])
+        return Grid._of([fn(e) for e in self], self._shape)
 
-    def map_pos(self, fn: Callable[[Coordinate], S]) -> Grid[S]:
-        n, m = self.shape
-        return Grid([[ fn((i,j)) for j in range(m)] for i in range(n)])
+    def map_pos(self, fn: Callable[[Coordinate], Any]) -> Grid[Any]:
+        return Grid._of([fn(ij) for ij in crange(self._shape)], self._shape)
 
     def subgrid(self, start: Coordinate, end: Coordinate) -> Grid[S]:
-        """Create a subgrid of the grid. The subgrid can be smaller if it is partially outside.
+        """View on a subgrid of the grid. The subgrid can be smaller if it is partially outside.
         Works as range objects, but in two dimensions and end is taken in the subgrid."""
-        (si, sj), (ei, ej), (n, m) = start, end, self.shape
-        return Grid([row[max(sj, 0):min(ej, m)] for row in self._data[max(si, 0):min(ei, n)]])
+        (si, sj), (ei, ej), (n, m) = start, end, self._shape
+        si, sj, ei, ej = max(si, 0), max(sj, 0), min(ei, n), min(ej, m)
+        shape = (max(ei - si, 0), max(ej - sj, 0))
+        return self._view(shape, self.index((si, sj)), (self._stride, self._step))
 
     def transpose(self) -> Grid[S]:
-        """Transpose a grid as it was a matrix."""
-        n, m = self.shape
-        return Grid([[self[i,j] for i in range(n)] for j in range(m)])
+        """View on the grid transposed as it was a matrix."""
+        return self._view(self._shape[::-1], self._offset, (self._step, self._stride))
 
     def flip(self, axis: int=1) -> Grid[S]:
-        """Mirror the grid along a given axis."""
+        """View on the grid mirrored along a given axis."""
+        (n, m), offset = self._shape, self._offset
         match axis:
-            case 0: return Grid(self._data[::-1])
-            case 1: return Grid([row[::-1] for row in self._data])
+            case 0: return self._view(self._shape, offset + (n - 1) * self._stride, (-self._stride, self._step))
+            case 1: return self._view(self._shape, offset + (m - 1) * self._step, (self._stride, -self._step))
             case _: raise ValueError(f"axis {axis} is not valid. Please enter 0 or 1.")
 
     def rotate90(self, clockwize=True) -> Grid[S]:
-        """Rotates a grid clockwise or not. Defaults: Clockwize."""
+        """View on the grid rotated clockwise or not. Defaults: Clockwize."""
         return self.T.flip(axis=int(clockwize))
 
     def is_valid(self, ij: Coordinate) -> bool:
-        (n, m), (i, j) = self.shape, ij
+        (n, m), (i, j) = self._shape, ij
         return 0 <= i < n and 0 <= j < m
 
     def __repr__(self) -> str:
-        return "\n".join(" ".join(map(str, row)) for row in self._data)
\ No newline at end of file
+        return "\n".join(" ".join(map(str, row)) for row in self.rows)
+
+
+class NumpyGrid[S](Grid[S]):
+    """Grid stored in a flat numpy array (`uint8` for grids of characters), where the operations on the whole grid
+    are vectorized: `map` through a lookup table, comparisons to a value or to another grid returning boolean masks
+    (`grid == "#"`), `count`, `argwhere` and the reductions `sum`, `min`, `max`, `any` and `all`.
+    Its cells have the type of the array: a value that doesn't fit raises an error instead of changing the storage.
+    The 2D array is available as `grid.array`, to go further with numpy, views included."""
+    __slots__ = ()
+
+    def __init__(self, data: list[list[S]]) -> None:
+        assert all(len(row) == len(data[0]) for row in data)
+        shape = (len(data), len(data[0]) if data else 0)
+        values = [e for row in data for e in row]
+        if values and all(type(v) is str and len(v) == 1 and ord(v) < 256 for v in values):
+            self._set(np.frombuffer(bytearray("".join(values), "latin-1"), dtype=np.uint8), shape, chars=True)
+        else:
+            self._set(np.array(values).reshape(-1), shape, chars=False)
+
+    @classmethod
+    def _of(cls, data: Any, shape: tuple[int, int], chars: bool = False) -> NumpyGrid:
+        grid = cls.__new__(cls)
+        grid._set(np.ascontiguousarray(data).reshape(-1), shape, chars)
+        return grid
+
+    @classmethod
+    def from_strings(cls, data: list[str], backend: Backend = "numpy") -> NumpyGrid[str]:
+        assert all(len(row) == len(data[0]) for row in data)
+        shape = (len(data), len(data[0]) if data else 0)
+        buffer = bytearray("".join(data), "latin-1")  # writable, shared with the array
+        return cls._of(np.frombuffer(buffer, dtype=np.uint8), shape, chars=True)
+
+    @property
+    def array(self) -> Any:
+        """2D array of the cells (their codes for a grid of characters), sharing the memory of the grid."""
+        if not self.is_view:
+            return self._data.reshape(self._shape)
+        size = self._data.itemsize
+        start = self._data[self._offset:]  # the strides of the view can go backward from its first cell
+        return np.lib.stride_tricks.as_strided(start, self._shape, (self._stride * size, self._step * size))
+
+    def _value(self, value: Any) -> Any:
+        """Value as stored in the array."""
+        if isinstance(value, NumpyGrid):
+            return value.array
+        return ord(value) if self._chars and isinstance(value, str) else value
+
+    def _decode(self, value: Any) -> S:
+        return chr(value) if self._chars else value.item()  # type: ignore
+
+    def __getitem__(self, idx: Coordinate) -> S:
+        if not self.is_valid(idx):
+            raise IndexError(f"{idx} is out of the grid of shape {self._shape}")
+        return self._decode(self._data[self.index(idx)])
+
+    def at(self, k: int) -> S:
+        return self._decode(self._data[k])
+
+    def set_at(self, k: int, value: S) -> None:
+        self._data[k] = self._value(value)
+
+    def _flat(self) -> Any:
+        return self.array.ravel()
+
+    def __iter__(self) -> Iterator[S]:
+        return iter(self._cells(self._flat()))
+
+    def _cells(self, data: Any) -> list[S]:
+        return list(data.tobytes().decode("latin-1")) if self._chars else data.tolist()
+
+    def copy(self, compact: bool = True) -> Grid[S]:
+        if not compact:
+            return super().copy(compact)
+        return NumpyGrid._of(self.array.copy(), self._shape, self._chars)
+
+    #
+    #  Vectorized operations
+    #
+
+    def _mask(self, mask: Any) -> NumpyGrid[bool]:
+        return NumpyGrid._of(mask, self._shape)
+
+    def __eq__(self, other: object) -> NumpyGrid[bool]:  # type: ignore
+        return self._mask(self.array == self._value(other))
+
+    def __ne__(self, other: object) -> NumpyGrid[bool]:  # type: ignore
+        return self._mask(self.array != self._value(other))
+
+    def __lt__(self, other: Any) -> NumpyGrid[bool]: return self._mask(self.array < self._value(other))
+    def __le__(self, other: Any) -> NumpyGrid[bool]: return self._mask(self.array <= self._value(other))
+    def __gt__(self, other: Any) -> NumpyGrid[bool]: return self._mask(self.array > self._value(other))
+    def __ge__(self, other: Any) -> NumpyGrid[bool]: return self._mask(self.array >= self._value(other))
+
+    __hash__ = None  # type: ignore
+
+    def __bool__(self) -> bool:
+        raise ValueError("The truth value of a grid is ambiguous. Please use grid.any() or grid.all().")
+
+    def count(self, value: S) -> int:
+        return int(np.count_nonzero(self.array == self._value(value)))
+
+    def argwhere(self, value: S) -> list[Coordinate]:
+        return [tuple(ij) for ij in np.argwhere(self.array == self._value(value)).tolist()]
+
+    def sum(self) -> Any: return self.array.sum().item()
+    def min(self) -> S: return self._decode(self.array.min())
+    def max(self) -> S: return self._decode(self.array.max())
+    def any(self) -> bool: return bool(self.array.any())
+    def all(self) -> bool: return bool(self.array.all())
+
+    def map(self, fn: Callable[[S], R]) -> Grid[R]:
+        """Apply a function to the cells, called once per distinct value and broadcast through a lookup table."""
+        data = self._flat()
+        if data.dtype == np.uint8:  # table of the 256 codes, indexed by the cells themselves
+            values, index = np.flatnonzero(np.bincount(data, minlength=256)).astype(np.uint8), data
+            size = 256
+        else:
+            values, index = np.unique(data, return_inverse=True)
+            size = len(values)
+        results = [fn(e) for e in self._cells(values)]
+        positions = values if size == 256 else np.arange(size)
+
+        def lookup(table: list, dtype: Any = None) -> Any:
+            lut = np.zeros(size, dtype=dtype or np.array(table).dtype)
+            lut[positions] = table
+            return lut[index]
+
+        if all(type(v) is str and len(v) == 1 and ord(v) < 256 for v in results):
+            return NumpyGrid._of(lookup([ord(v) for v in results], np.uint8), self._shape, chars=True)
+        if all(isinstance(v, (bool, int, float)) for v in results):
+            return NumpyGrid._of(lookup(results), self._shape)
+        return Grid._of([results[i] for i in np.searchsorted(values, data).tolist()], self._shape)
@@ -0,0 +1,90 @@
+"""Incremental runs of the year runner: the results of a part are kept in the cache (see `aoc.cache`),
+and reused as long as its solution file, the files it imports from the `aoc` package (or from its own
+directory, for the helpers of the legacy years) and its inputs are unchanged.
+Runs in profiling mode are never reused, and `python -m aoc run 2024 --force` runs everything again."""
+from pathlib import Path
+from typing import Optional
+import ast
+import os
+import pickle
+import sys
+
+from . import Result, _date_of, bench, memory, profiling
+from .cache import _digest, cache_dir, write_atomic
+
+PACKAGE = Path(__file__).parent
+
+
+def _module_files(base: Path, dotted: str) -> list[Path]:
+    """Files of a module and of its parent packages, relative to a base directory, if they exist."""
+    parts = dotted.split(".") if dotted else []
+    files = [base.joinpath(*parts[:i], "__init__.py") for i in range(len(parts) + 1)]
+    files += [base.joinpath(*parts).with_suffix(".py")] if parts else []
+    return [f for f in files if f.is_file()]
+
+
+def _imports(file: Path) -> list[Path]:
+    """Files directly imported by a file: from the `aoc` package, relatively inside it,
+    or from the directory of the file for the files outside the package."""
+    inside = file.is_relative_to(PACKAGE)
+    files = []
+    for node in ast.walk(ast.parse(file.read_bytes())):
+        if isinstance(node, ast.Import):
+            modules = [(None, alias.name) for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module or ""
+            base = file.parents[node.level - 1] if node.level else None
+            modules = [(base, module)] + [(base, f"{module}.{alias.name}".lstrip(".")) for alias in node.names]
+        else:
+            continue
+        for base, module in modules:
+            if base is None and (module == "aoc" or module.startswith("aoc.")):
+                base = PACKAGE.parent
+            elif base is None and not inside:
+                base = file.parent
+            if base is not None:
+                files += _module_files(base, module)
+    return files
+
+
+def dependencies(path: Path) -> list[Path]:
+    """A solution file and all the files it imports transitively (see `_imports`), sorted."""
+    seen, todo = set[Path](), [path.resolve()]
+    while todo:
+        if (file := todo.pop()) not in seen:
+            seen.add(file)
+            todo += _imports(file)
+    return sorted(seen)
+
+
+def _key(path: Path) -> str:
+    """Hash of the files a part depends on, and of the configuration changing its results."""
+    config = (sys.version, bench.config(), memory.enabled(), os.environ.get("AOC_INPUT"))
+    return _digest(bench.file_hash(*dependencies(path)), repr(config))
+
+
+def _cache_path(path: Path, part: Optional[int]) -> Optional[Path]:
+    if (directory := cache_dir()) is None or profiling.enabled():
+        return None
+    year, day = _date_of(path)
+    return directory / "runs" / f"{year}-{day}-{'all' if part is None else f'p{part}'}.pickle"
+
+
+def load(path: Path, part: Optional[int]) -> Optional[list[Result]]:
+    """Results of a part (of all the parts of a legacy day if None) from its last run, if they are still valid."""
+    if (cache := _cache_path(path, part)) is None or not cache.exists():
+        return None
+    key, inputs, results = pickle.loads(cache.read_bytes())
+    if key != _key(path) or any(not p.exists() or bench.file_hash(p) != h for p, h in inputs.items()):
+        return None
+    for r in results:
+        r.cached = True
+    return results
+
+
+def store(path: Path, part: Optional[int], results: list[Result]) -> None:
+    """Keep the results of a part for the next runs, unless one of them failed to run."""
+    if (cache := _cache_path(path, part)) is None or any(r.error for r in results):
+        return
+    inputs = {p: bench.file_hash(p) for r in results for p in r.inputs}
+    write_atomic(cache, pickle.dumps((_key(path), inputs, results)))
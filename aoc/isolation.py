@@ -0,0 +1,91 @@
+"""Execution of a decorated part in a child process, killed if it exceeds its timeout:
+`@section.p1(sol=..., timeout=30)`. The result (or the error) of the part is sent back through a pipe.
+Also used by `run_day` to execute the parts of a day concurrently.
+
+Where supported (POSIX), the child is the leader of its own process group, so that killing it also kills
+the processes it started, e.g. the pool workers of `aoc.parallel.map_grid`."""
+from multiprocessing.connection import Connection
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from typing import Any, Optional
+import multiprocessing
+import os
+import signal
+import traceback
+
+GROUPS = hasattr(os, "setpgid")
+
+
+def _child(conn: Connection, source: Path, part: int, variant: Optional[str]) -> None:
+    """Execute the part in the child process and send its result to the parent."""
+    if GROUPS:
+        os.setpgid(0, 0)
+    from .runner import find_part, import_day  # pylint: disable=import-outside-toplevel  # circular import
+    try:
+        fn = find_part(import_day(source), part, variant)
+        conn.send(fn.execute_here())
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        traceback.print_exc()
+        try:
+            conn.send(e)
+        except Exception:  # pylint: disable=broad-exception-caught  # the exception can't be pickled
+            conn.send(RuntimeError(repr(e)))
+    finally:
+        conn.close()
+
+
+def start(source: Path, part: int, variant: Optional[str] = None) -> tuple[BaseProcess, Connection]:
+    """Start the execution of a part of a solution file in a child process.
+    Returns the process and the end of the pipe its result is received from (see `wait`)."""
+    methods = multiprocessing.get_all_start_methods()
+    ctx = multiprocessing.get_context("fork" if "fork" in methods else "spawn")
+    receiver, sender = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_child, args=(sender, source, part, variant))
+    process.start()
+    if GROUPS:
+        try:
+            os.setpgid(process.pid, process.pid)  # also from the parent, so that the group exists once started
+        except OSError:
+            pass  # already done by the child, or the child is gone
+    sender.close()
+    return process, receiver
+
+
+def kill(process: BaseProcess) -> None:
+    """Kill a part started by `start` along with the processes it started.
+    The group is terminated rather than killed, so that the resource tracker of the part, which ignores the
+    termination, outlives the workers and releases their shared memory."""
+    if GROUPS:
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except OSError:
+            pass  # the group is gone
+    process.kill()
+
+
+def wait(process: BaseProcess, receiver: Connection, timeout: Optional[float] = None) -> Any:
+    """Wait for the result of a part started by `start`, and return it.
+    Returns None if the part is killed because it exceeds its timeout, and raises the errors of the part."""
+    try:
+        if not receiver.poll(timeout):
+            kill(process)
+            return None
+        received = receiver.recv()
+    except EOFError:
+        received = RuntimeError("The process executing the part died unexpectedly")
+    except BaseException:
+        kill(process)  # interrupted: in its own group, the part doesn't receive the interruption
+        raise
+    finally:
+        process.join()
+        receiver.close()
+
+    if isinstance(received, BaseException):
+        raise received
+    return received
+
+
+def run_isolated(source: Path, part: int, timeout: Optional[float], variant: Optional[str] = None) -> Any:
+    """Execute a part of a solution file in a child process and return its result.
+    Returns None if the part is killed because it exceeds its timeout, and raises the errors of the part."""
+    return wait(*start(source, part, variant), timeout)
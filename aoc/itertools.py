@@ -26,6 +26,20 @@ def iter_split(char: str, iterable: Iterable[str]) -> Iterator[list[str]]:
     return (s.split(char) for s in iterable)
 
 
+def iter_blocks(iterable: Iterable[str]) -> Iterator[list[str]]:
+    """Group lines into blocks separated by empty lines.
+    The lines are consumed lazily: only up to the end of the block being yielded."""
+    block = []
+    for line in iterable:
+        if line:
+            block.append(line)
+        elif block:
+            yield block
+            block = []
+    if block:
+        yield block
+
+
 def find(l: list[T], fn: Callable[[T], bool]) -> tuple[int, T | None]:
     """Find an element in a list along with its index."""
     for i, x in enumerate(l):
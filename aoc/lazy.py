@@ -0,0 +1,24 @@
+"""Lazy imports, to keep the startup of short days from being dominated by heavy packages.
+
+    plt = lazy_import("matplotlib.pyplot")  # nothing is imported yet
+    plt.figure()                            # matplotlib.pyplot is imported here
+
+`from package import name` can't be made lazy: the attribute has to be accessed through the module."""
+from types import ModuleType
+from typing import Any
+import importlib
+
+
+class LazyModule(ModuleType):
+    """Placeholder of a module, importing it at the first access to one of its attributes.
+    The attributes of the module are then copied, so that the next accesses cost nothing."""
+
+    def __getattr__(self, attr: str) -> Any:
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Module `name`, imported only when one of its attributes is used."""
+    return LazyModule(name)
@@ -0,0 +1,195 @@
+"""Adapter running the solutions written before the `aoc` package (2021 to 2023), so that they join the runner,
+the benchmarks and the history with the same `Result` as the decorated parts.
+
+Legacy scripts compute everything when executed, from inputs opened relatively to their own directory,
+and print their answers. Each day is executed in a subprocess (`python -m aoc.legacy`), through `runpy`, where:
+- opening `input(s)/{day}.txt` opens the input of the day instead (or `AOC_INPUT`, see `aoc.gen`),
+- the prints are recorded, and the answers are found in the lines labelled by a part
+(e.g. `result 1 : 42` or `partie 2 : 42`), or else in the lines made of a single number,
+- the parts decorated by the `section` of the 2023 utils are timed and checked directly.
+The time of a part that is not decorated is the time between its answer and the previous one."""
+from collections.abc import Callable
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Optional
+import builtins
+import io
+import os
+import pickle
+import re
+import runpy
+import subprocess
+import sys
+import tempfile
+
+from . import Result, _date_of, bench
+
+LABEL = re.compile(r"^\s*(?:r[ée]sultat|result|partie|part)\s*(\d*)\s*:\s*(.+?)\s*$", re.IGNORECASE)
+NUMBER = re.compile(r"^\s*-?\d+\s*$")
+
+
+def is_legacy(path: Path) -> bool:
+    """Whether a solution file is not made of parts decorated by `aoc.section`, without importing it."""
+    return "@section.p" not in path.read_text(encoding="utf-8")
+
+
+def default_timeout() -> Optional[float]:
+    """Timeout in seconds of each execution of a legacy file, from `AOC_TIMEOUT` (default 300s, 0 to disable):
+    unlike the decorated parts, legacy days can't declare their own timeout."""
+    timeout = float(os.environ.get("AOC_TIMEOUT", 300))
+    return timeout or None
+
+
+def run_legacy(path: Path, timeout: Optional[float] = None) -> list[Result]:
+    """Execute a legacy solution file in a subprocess and return the results of its parts.
+    The benchmark mode applies (`AOC_BENCH`): the whole file is then executed several times,
+    each execution having `timeout` seconds (default: `default_timeout`).
+    If the file fails or exceeds its timeout, the error is reported in the result of the next part."""
+    year, day = _date_of(path)
+    timeout = default_timeout() if timeout is None else timeout
+    if timeout:
+        repetitions, warmup = bench.config()
+        timeout *= warmup + repetitions if repetitions else 1
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory) / "results.pickle"
+        command = [sys.executable, "-m", "aoc.legacy", str(path.resolve()), str(output)]
+        try:
+            process = subprocess.run(command, capture_output=True, text=True, timeout=timeout, check=False)
+        except subprocess.TimeoutExpired:
+            return [Result(year, day, 1, None, timeout or 0., error=f"Timeout: stopped after {timeout}s")]
+        if not output.exists():
+            error = process.stderr.strip().splitlines()[-1:] or [f"exit code {process.returncode}"]
+            return [Result(year, day, 1, None, 0., error=error[0])]
+        return pickle.loads(output.read_bytes())
+
+
+class Recorder(io.TextIOBase):
+    """Text stream recording the lines written, with the time at which they end."""
+
+    def __init__(self) -> None:
+        self.lines: list[tuple[int, str]] = []
+        self._line = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        *lines, self._line = (self._line + s).split("\n")
+        t = perf_counter_ns()
+        self.lines.extend((t, line) for line in lines)
+        return len(s)
+
+
+def answers_of(lines: list[tuple[int, str]]) -> dict[int, tuple[int, str]]:
+    """Answers found in the printed lines, with the time they were printed, by part.
+    Labels missing their number, or repeating one, are counted as the next part."""
+    answers: dict[int, tuple[int, str]] = {}
+    for t, line in lines:
+        if m := LABEL.match(line):
+            part = int(m[1]) if m[1] and int(m[1]) not in answers else len(answers) + 1
+            answers[part] = (t, m[2])
+    if not answers:
+        answers = {i: (t, line.strip()) for i, (t, line) in enumerate((l for l in lines if NUMBER.match(l[1])), 1)}
+    return answers
+
+
+def _parse(answer: str) -> Any:
+    return int(answer) if NUMBER.match(answer) else answer
+
+
+def _redirect_open(day: int, input_: Path) -> Callable:
+    """`open` replacing the input of the day by `input_`, and the `input/` directory by `inputs/`:
+    the scripts of some years refer to a directory that doesn't exist."""
+    open_ = builtins.open
+
+    def open_input(file, *args, **kwargs):
+        if isinstance(file, (str, Path)) and not (path := Path(file)).is_absolute() \
+                and path.parent.name in ("input", "inputs"):
+            file = input_ if path.name == f"{day}.txt" else path.parent.with_name("inputs") / path.name
+        return open_(file, *args, **kwargs)
+    return open_input
+
+
+def _time_sections(sections: dict[int, tuple[Any, int, Any]]) -> None:
+    """Replace the `section` decorator of the 2023 utils (if it can be imported) with one timing the parts
+    and recording their answer in `sections`. Its own check of the solution is disabled: it is done by the runner."""
+    try:
+        import utils  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return
+    if not hasattr(utils, "section"):
+        return
+    section = utils.section
+
+    def timed_section(*args, sol=None, **kwargs):
+        part = kwargs.get("part", args[2] if len(args) > 2 else None)
+
+        def decorator(part_fn: Callable):
+            def timed(*fn_args):
+                t0 = perf_counter_ns()
+                answer = part_fn(*fn_args)
+                if part is not None:
+                    sections[part] = (answer, perf_counter_ns() - t0, sol)
+                return answer
+            return section(*args, **kwargs)(timed)
+        return decorator
+    utils.section = timed_section
+
+
+def main(path: Path, output: Path) -> None:
+    """Execute a legacy solution file and write the pickled results of its parts in `output`."""
+    year, day = _date_of(path)
+    input_ = Path(os.environ.get("AOC_INPUT") or f"{year}/inputs/{day}.txt").resolve()
+    sys.path[:0] = [str(path.parent), os.getcwd()]  # the imports of the script and the `aoc` package
+    os.chdir(path.parent)
+    builtins.open = _redirect_open(day, input_)
+    sections: dict[int, tuple[Any, int, Any]] = {}
+    _time_sections(sections)
+
+    repetitions, warmup = bench.config()
+    timings: dict[int, list[int]] = {}
+    answers: dict[int, Any] = {}
+    error: Optional[str] = None
+    for i in range(warmup + repetitions if repetitions else 1):
+        recorder = Recorder()
+        stdout, sys.stdout = sys.stdout, recorder
+        sections.clear()
+        t0 = perf_counter_ns()
+        try:
+            runpy.run_path(str(path), run_name="__main__")
+        except SystemExit as e:  # some scripts exit once answered
+            if e.code not in (None, 0):
+                error = f"SystemExit: {e.code}"
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            error = f"{type(e).__name__}: {e}"
+        finally:
+            sys.stdout = stdout
+
+        if sections:
+            found = {part: (answer, time) for part, (answer, time, _) in sections.items()}
+        else:
+            printed = answers_of(recorder.lines)
+            times = [t0] + [t for t, _ in printed.values()]
+            found = {part: (_parse(a), t - previous) for (part, (t, a)), previous in zip(printed.items(), times)}
+        for part, (answer, time) in found.items():
+            answers[part] = answer
+            if i >= (warmup if repetitions else 0):
+                timings.setdefault(part, []).append(time)
+        if error:
+            break
+
+    if not answers and not error:
+        error = "No answer found in the output"
+    results = []
+    for part in sorted(answers):
+        stats = bench.Stats.of(timings[part]) if repetitions and part in timings else None
+        time = stats.median if stats else timings.get(part, [0])[-1] / 1e9
+        sol = sections[part][2] if part in sections else None
+        results.append(Result(year, day, part, answers[part], time, sol, stats=stats, source=path, inputs=[input_]))
+    if error:
+        results.append(Result(year, day, len(answers) + 1, None, 0., error=error))
+    output.write_bytes(pickle.dumps(results))
+
+
+if __name__ == "__main__":
+    main(Path(sys.argv[1]), Path(sys.argv[2]))
@@ -0,0 +1,99 @@
+"""Memory tracking of the decorated parts, enabled by `AOC_MEMORY=1` (or `python -m aoc run 2024 --memory`)
+or when a part is given a memory budget: `@section.p1(max_mb=100)`.
+The peak of the memory allocated by Python is traced with `tracemalloc`, which slows down the execution.
+The peak resident set size (RSS) of the process is reported as well."""
+from __future__ import annotations
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+import sys
+import threading
+import tracemalloc
+
+from .modes import memory as enabled
+
+MB = 2 ** 20
+
+
+@dataclass
+class Memory:
+    """Memory used by a part, in MB, and its top allocation sites (taken close to the peak)."""
+    peak: float
+    rss: Optional[float] = None
+    top: list[str] = field(default_factory=list)
+
+    def __str__(self) -> str:
+        rss = f" | peak RSS {self.rss:.1f}MB" if self.rss is not None else ""
+        return f"peak {self.peak:.1f}MB{rss}"
+
+
+def _reset_peak_rss() -> None:
+    """Reset the peak RSS of the process, only possible on Linux."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        pass
+
+
+def _peak_rss() -> Optional[float]:
+    """Peak RSS of the process, since the last reset on Linux, since the start of the process otherwise."""
+    try:
+        status = Path("/proc/self/status").read_text().splitlines()
+        return next(int(l.split()[1]) / 1024 for l in status if l.startswith("VmHWM:"))
+    except (OSError, StopIteration):
+        pass
+    try:
+        import resource  # pylint: disable=import-outside-toplevel  # not available on windows
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / MB if sys.platform == "darwin" else rss / 1024
+
+
+class track:
+    """Context manager tracking the memory used by the code executed in it, available in `memory` afterwards.
+    A thread watches the traced memory and takes a snapshot each time it grows by 10% over the last one,
+    to find the top allocation sites close to the peak. The memory used by the snapshots is left out of the peak."""
+
+    def __init__(self, top: int = 5, interval: float = 1e-3) -> None:
+        self.top, self.interval = top, interval
+        self.memory: Optional[Memory] = None
+
+    def __enter__(self) -> track:
+        self._started = not tracemalloc.is_tracing()
+        if self._started:
+            tracemalloc.start()
+        _reset_peak_rss()
+        tracemalloc.reset_peak()
+        self._base = self._peak = tracemalloc.get_traced_memory()[0]
+        self._sites, self._sites_size = list[str](), 0
+        self._done = threading.Event()
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+        return self
+
+    def _watch(self) -> None:
+        while not self._done.wait(self.interval):
+            current, peak = tracemalloc.get_traced_memory()
+            if current - self._base > 1.1 * self._sites_size + MB:
+                self._peak = max(self._peak, peak)
+                self._sites, self._sites_size = self._top_sites(tracemalloc.take_snapshot()), current - self._base
+                tracemalloc.reset_peak()
+
+    def __exit__(self, *exc) -> None:
+        self._done.set()
+        self._watcher.join()
+        peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+        if self._started:
+            tracemalloc.stop()
+        self.memory = Memory((peak - self._base) / MB, _peak_rss(), self._sites)
+
+    def _top_sites(self, snapshot: tracemalloc.Snapshot) -> list[str]:
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        return [
+            f"{Path(s.traceback[0].filename).name}:{s.traceback[0].lineno}: {s.size / MB:.1f}MB"
+            for s in snapshot.statistics("lineno")[:self.top]
+        ]
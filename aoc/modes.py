@@ -0,0 +1,22 @@
+"""Modes of execution of the parts, read from the environment: benchmark (`AOC_BENCH`), profiling (`AOC_PROFILE`)
+and memory tracking (`AOC_MEMORY`). They are off by default, and the modules implementing them (`aoc.bench`,
+`aoc.profiling` and `aoc.memory`) are only imported by `aoc` when they are on, so checking them costs nothing."""
+import os
+
+
+def _flag(name: str) -> bool:
+    return os.environ.get(name, "") not in ("", "0")
+
+
+def benchmark() -> tuple[int, int]:
+    """Number of repetitions and of warmup runs of the benchmark mode, from `AOC_BENCH` and `AOC_WARMUP`.
+    No repetition means the benchmark mode is disabled."""
+    return int(os.environ.get("AOC_BENCH", 0)), int(os.environ.get("AOC_WARMUP", 1))
+
+
+def profiling() -> bool:
+    return _flag("AOC_PROFILE")
+
+
+def memory() -> bool:
+    return _flag("AOC_MEMORY")
@@ -0,0 +1,136 @@
+"""Process pool for the "try every candidate" searches on a grid. The grid is placed once in shared memory
+(`multiprocessing.shared_memory`) instead of being pickled for the workers, and each worker reads it through
+a `SharedGrid`: a read-only view of the shared buffer, with a scratch overlay holding the writes of the worker,
+cleared before each task.
+
+    loops = map_grid(is_loop, grid, candidates, start)  # [is_loop(grid, c, start) for c in candidates]
+
+Grids of single characters or of small integers (0 to 255) can be shared. The function has to be defined
+at the top level of a module. The workers are forked, so that they inherit the modules of the days loaded by
+the runner (`_aoc_2024_6`...), which could not be imported again by name under the spawn or forkserver methods:
+the fork start method is required, it is not available on Windows.
+
+The workers don't inherit the instrumentation of the part: the memory tracking (see `aoc.memory`) and
+the profiling (see `aoc.profiling`) are stopped in them, so the memory used by the workers is not counted
+in the peak of the part, nor checked against its `max_mb`."""
+from array import array
+from collections.abc import Callable, Iterable
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Optional, TypeVar
+import math
+import multiprocessing
+import os
+import tracemalloc
+
+from . import profiling
+from .grid import Coordinate, Grid
+
+R = TypeVar("R")
+
+
+class SharedGrid:
+    """Grid backed by a read-only buffer of bytes, row after row, with an overlay of the values written."""
+
+    def __init__(self, buffer: memoryview, shape: tuple[int, int], kind: str) -> None:
+        self._buffer, self._shape = buffer.toreadonly(), shape
+        self._decode: Callable[[int], Any] = chr if kind == "str" else int
+        self._overlay: dict[int, Any] = {}
+
+    @property
+    def shape(self) -> tuple[int, int]:
+        return self._shape
+
+    def __getitem__(self, idx: Coordinate) -> Any:
+        return self.at(self.index(idx))
+
+    def __setitem__(self, idx: Coordinate, value: Any) -> None:
+        self._overlay[self.index(idx)] = value
+
+    @property
+    def stride(self) -> int:
+        return self._shape[1]
+
+    step = 1
+
+    def index(self, idx: Coordinate) -> int:
+        """Linear index of a cell, as `Grid.index`."""
+        return idx[0] * self._shape[1] + idx[1]
+
+    def at(self, k: int) -> Any:
+        """Cell at a linear index, as `Grid.at`."""
+        if self._overlay and k in self._overlay:
+            return self._overlay[k]
+        return self._decode(self._buffer[k])
+
+    def set_at(self, k: int, value: Any) -> None:
+        self._overlay[k] = value
+
+    def is_valid(self, ij: Coordinate) -> bool:
+        (n, m), (i, j) = self._shape, ij
+        return 0 <= i < n and 0 <= j < m
+
+    def reset(self) -> None:
+        """Discard the values written."""
+        self._overlay.clear()
+
+
+def _encode(grid: Grid) -> tuple[bytes, str]:
+    """Bytes of a grid, row after row, and the kind of its values."""
+    if isinstance(data := grid._flat(), bytearray):  # pylint: disable=protected-access  # already stored as bytes
+        return bytes(data), "str"
+    if isinstance(data, array) and data.typecode == "B":  # integers already stored as bytes
+        return data.tobytes(), "int"
+    values = list(grid)
+    if all(isinstance(v, str) and len(v) == 1 for v in values):
+        return "".join(values).encode("latin-1"), "str"
+    if all(isinstance(v, int) and 0 <= v < 256 for v in values):
+        return bytes(values), "int"
+    raise TypeError("Only grids of single characters or of integers between 0 and 255 can be shared.")
+
+
+# state of a worker, set once by `_init`
+_worker: tuple[SharedMemory, SharedGrid, Callable, tuple] | None = None
+
+
+def _init(name: str, shape: tuple[int, int], kind: str, fn: Callable, args: tuple) -> None:
+    global _worker  # pylint: disable=global-statement
+    # forked from a part, possibly traced or profiled: the instrumentation would slow the worker down
+    tracemalloc.stop()
+    profiling.disable_inherited()
+    memory = SharedMemory(name)  # kept along with the grid, closing it would release the buffer
+    _worker = (memory, SharedGrid(memory.buf, shape, kind), fn, args)
+
+
+def _task(task: Any) -> Any:
+    assert _worker is not None
+    _, grid, fn, args = _worker
+    grid.reset()
+    return fn(grid, task, *args)
+
+
+def map_grid(
+    fn: Callable[..., R], grid: Grid, tasks: Iterable, *args: Any,
+    processes: Optional[int] = None, chunksize: Optional[int] = None
+) -> list[R]:
+    """Apply `fn(shared_grid, task, *args)` to every task in a pool of processes and return the results in order.
+    The tasks are sent by chunks, by default 4 chunks per process to balance uneven tasks.
+    The pool and the shared memory are released when done, even if a task fails."""
+    if "fork" not in multiprocessing.get_all_start_methods():
+        raise RuntimeError("map_grid needs the fork start method of multiprocessing, not available on this platform.")
+    tasks = list(tasks)
+    data, kind = _encode(grid)
+    processes = processes or os.cpu_count() or 1
+    chunksize = chunksize or max(1, math.ceil(len(tasks) / (4 * processes)))
+
+    memory = SharedMemory(create=True, size=max(1, len(data)))
+    try:
+        memory.buf[:len(data)] = data
+        context = multiprocessing.get_context("fork")  # whatever the default start method
+        with context.Pool(processes, _init, (memory.name, grid.shape, kind, fn, args)) as pool:
+            results = pool.map(_task, tasks, chunksize)
+            pool.close()
+            pool.join()
+    finally:
+        memory.close()
+        memory.unlink()
+    return results
@@ -0,0 +1,78 @@
+"""Profiling of the decorated parts, enabled by `AOC_PROFILE=1` (or `python -m aoc run 2024 --profile`).
+Each part is run under cProfile and under a sampler of its stack, which write in `profiles/{year}/{day}-p{part}`:
+- `.prof`: cProfile statistics, to be read with `pstats` or `snakeviz`.
+- `.collapsed`: sampled stacks in the collapsed format, ready for `flamegraph.pl` or `speedscope`."""
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+import cProfile
+import os
+import sys
+import threading
+
+from .modes import profiling as enabled
+
+# profiler of the running part, inherited by the processes it forks (see `disable_inherited`)
+_profiler: Optional[cProfile.Profile] = None
+
+
+def profiles_dir() -> Path:
+    return Path(os.environ.get("AOC_PROFILE_DIR", "profiles"))
+
+
+class Sampler(threading.Thread):
+    """Thread sampling the stack of another thread at a regular interval.
+    The sampling rate is bounded by the switch interval of the interpreter (see `sys.getswitchinterval`)."""
+
+    def __init__(self, thread_id: int, interval: float = 1e-3) -> None:
+        super().__init__(daemon=True)
+        self.thread_id, self.interval = thread_id, interval
+        self.stacks = Counter[str]()
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.wait(self.interval):
+            frame, stack = sys._current_frames().get(self.thread_id), []  # pylint: disable=protected-access
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._done.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        """Sampled stacks in the collapsed format: one stack per line, followed by its number of samples."""
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+@contextmanager
+def profile(year: int, day: int, part: int) -> Iterator[Path]:
+    """Profile the code executed in the context, for the given part. Yields the path of the profiles, without suffix."""
+    global _profiler  # pylint: disable=global-statement
+    path = profiles_dir() / str(year) / f"{day}-p{part}"
+    profiler, sampler = cProfile.Profile(), Sampler(threading.get_ident())
+    sampler.start()
+    profiler.enable()
+    _profiler = profiler
+    try:
+        yield path
+    finally:
+        _profiler = None
+        profiler.disable()
+        sampler.stop()
+        path.parent.mkdir(exist_ok=True, parents=True)
+        profiler.dump_stats(path.with_suffix(".prof"))
+        path.with_suffix(".collapsed").write_text(sampler.collapsed(), encoding="utf-8")
+
+
+def disable_inherited() -> None:
+    """Stop the profiling of the part in a process it forked (e.g. a worker of `aoc.parallel`),
+    only the process of the part is profiled. The sampler, as a thread, is not inherited."""
+    if _profiler is not None:
+        _profiler.disable()
@@ -0,0 +1,43 @@
+"""Race between the implementations of the parts of a day: the default one and its variants,
+registered with `@section.p2(sol=..., variant="numpy")`. Used through `python -m aoc race 2024 6`.
+All the implementations are benchmarked on the same input, one after the other, and have to agree
+with the default implementation and with the solution."""
+from itertools import groupby
+import os
+
+from . import Result
+from .runner import discover, import_day, parts_of, run_part, status
+
+
+def race(year: int, day: int, repetitions: int = 10) -> list[Result]:
+    """Benchmark all the implementations of the parts of a day, sorted by part with the default one first."""
+    paths = discover(year, [day])
+    if not paths:
+        raise FileNotFoundError(f"No solution file for day {day} of year {year}")
+    os.environ["AOC_BENCH"] = str(repetitions)
+    return [run_part(paths[0], fn.part, fn.variant) for fn in parts_of(import_day(paths[0]), variants=True)]
+
+
+def disagreements(results: list[Result]) -> list[Result]:
+    """Implementations whose answer differs from the default implementation of their part, or failed."""
+    default = {r.part: r.answer for r in results if r.variant is None}
+    return [r for r in results if r.error or r.verified is False or r.answer != default.get(r.part, r.answer)]
+
+
+def print_race(results: list[Result]) -> None:
+    """Print the implementations of each part with their speedup relative to the default one."""
+    default = {r.part: r.answer for r in results if r.variant is None}
+    print(f"{'year':>4} {'day':>3} {'part':>4}  {'variant':<12} {'answer':<20} {'time':>10} {'speedup':>8}  status")
+    print("-" * 82)
+    for _, group in groupby(results, key=lambda r: r.part):
+        first, *others = group
+        baseline = first.execution_time if first.variant is None and not first.error else None
+        for r in (first, *others):
+            answer = r.error if r.error else r.answer
+            ok = baseline and r.execution_time and not r.error
+            speedup = f"{baseline / r.execution_time:>7.2f}x" if ok else f"{'-':>8}"
+            differs = not r.error and r.verified is not False and r.answer != default.get(r.part, r.answer)
+            flag = "DIFFERS" if differs else status(r)
+            print(f"{r.year:>4} {r.day:>3} {r.part:>4}  {r.variant or 'default':<12} {str(answer):<20}"
+                  f" {r.execution_time:>9.5f}s {speedup}  {flag}")
+    print("-" * 82)
@@ -0,0 +1,99 @@
+"""Output of the results, chosen with `AOC_OUTPUT`:
+- `text` (default): a banner per part run on its own, a table for the year runner.
+- `jsonl`: one JSON record per part, on the standard output, or appended to a file with `jsonl:results.jsonl`.
+- the import path of a `Reporter` subclass (e.g. `dashboard.reporters.Nightly`) for a custom sink.
+
+Each output is written at once, so that the outputs of parts running in parallel don't interleave."""
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from dataclasses import asdict
+from importlib import import_module
+from pathlib import Path
+from typing import Any, Optional, TYPE_CHECKING
+import json
+import os
+import sys
+
+from .lazy import lazy_import
+
+runner = lazy_import("aoc.runner")  # not needed by the parts run on their own
+
+if TYPE_CHECKING:
+    from . import Result
+    from .context import Phase
+
+
+class Reporter(ABC):
+    """Sink of the results: `part` receives the result of a part run on its own, `run` those of the year runner."""
+
+    def part(self, result: Result) -> None:
+        self.run([result])
+
+    @abstractmethod
+    def run(self, results: list[Result]) -> None: ...
+
+
+class TextReporter(Reporter):
+    """Human readable output: the banner of `print_answer` and the table of `aoc.runner`."""
+
+    def part(self, result: Result) -> None:
+        from . import print_answer  # pylint: disable=import-outside-toplevel  # circular import
+        print_answer(
+            result.answer, result.day, result.part, result.execution_time, result.stats, result.phases,
+            result.memory, result.variant
+        )
+
+    def run(self, results: list[Result]) -> None:
+        runner.print_table(results)
+
+
+def _json_safe(value: Any) -> Any:
+    """The value if it can be written in JSON, its string otherwise."""
+    return value if value is None or isinstance(value, (bool, int, float, str)) else str(value)
+
+
+def _phases(phase: Phase) -> list[dict]:
+    return [{"name": c.name, "time": c.time, "count": c.count, "children": _phases(c)} for c in phase.children.values()]
+
+
+def to_json(result: Result) -> dict:
+    """JSON record of a result."""
+    return {
+        "year": result.year, "day": result.day, "part": result.part, "variant": result.variant,
+        "answer": _json_safe(result.answer), "sol": _json_safe(result.sol),
+        "status": runner.status(result), "verified": result.verified, "error": result.error, "cached": result.cached,
+        "time": result.execution_time, "stats": result.stats and asdict(result.stats),
+        "phases": result.phases and _phases(result.phases), "memory": result.memory and asdict(result.memory),
+        "source": result.source and str(result.source), "inputs": [str(p) for p in result.inputs],
+    }
+
+
+class JsonlReporter(Reporter):
+    """One JSON record per line and per part, see `to_json`."""
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        self.path = path
+
+    def run(self, results: list[Result]) -> None:
+        lines = "".join(json.dumps(to_json(r)) + "\n" for r in results)
+        if self.path is None:
+            sys.stdout.write(lines)
+            sys.stdout.flush()
+        else:
+            self.path.parent.mkdir(exist_ok=True, parents=True)
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(lines)
+
+
+def reporter() -> Reporter:
+    """Reporter chosen by `AOC_OUTPUT`."""
+    output = os.environ.get("AOC_OUTPUT", "") or "text"
+    if output == "text":
+        return TextReporter()
+    if output == "jsonl" or output.startswith("jsonl:"):
+        path = output.removeprefix("jsonl").removeprefix(":")
+        return JsonlReporter(Path(path) if path else None)
+    module, _, name = output.rpartition(".")
+    if not module:
+        raise ValueError(f"AOC_OUTPUT={output} is not valid. Please enter 'text', 'jsonl[:path]' or a Reporter class.")
+    return getattr(import_module(module), name)()
@@ -0,0 +1,135 @@
+"""Run the decorated parts of a whole year at once, across a pool of processes.
+Used through `python -m aoc run 2024 [days...]` from the root directory.
+The days written before the `aoc` package are run as a whole through `aoc.legacy`."""
+from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from types import ModuleType
+from typing import Optional
+import io
+import sys
+
+from . import Result, _date_of, bench, incremental
+from .legacy import default_timeout, is_legacy, run_legacy
+
+
+def discover(year: int, days: Iterable[int] = ()) -> list[Path]:
+    """Find the solution files `./{year}/{day}.py` of a year, sorted by day.
+    If days are given, only keep those."""
+    days = set(days)
+    files = (p for p in Path(f"./{year}").glob("*.py") if p.stem.isdigit())
+    return sorted((p for p in files if not days or int(p.stem) in days), key=lambda p: int(p.stem))
+
+
+def import_day(path: Path) -> ModuleType:
+    """Import a solution file as a module without running its main block.
+    Modules are cached so a process imports each day only once."""
+    name = f"_aoc_{path.parent.name}_{path.stem}"
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = spec_from_file_location(name, path.resolve())
+    assert spec is not None and spec.loader is not None
+    module = module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def parts_of(module: ModuleType, variants: bool = False) -> list[Callable]:
+    """All the parts decorated by `section` in a module, sorted by part.
+    Alternative implementations (`variant=`) are only included if `variants` is set, after the default ones."""
+    parts = (fn for fn in vars(module).values() if callable(fn) and hasattr(fn, "execute"))
+    return sorted(
+        (fn for fn in parts if variants or fn.variant is None),
+        key=lambda fn: (fn.part, fn.variant is not None, fn.variant or "")
+    )
+
+
+def find_part(module: ModuleType, part: int, variant: Optional[str] = None) -> Callable:
+    """A part decorated by `section` in a module, the default implementation unless a variant is given."""
+    try:
+        return next(fn for fn in parts_of(module, variants=True) if fn.part == part and fn.variant == variant)
+    except StopIteration:
+        raise LookupError(f"No part {part}{f' ({variant})' if variant else ''} in {module.__file__}") from None
+
+
+def run_part(path: Path, part: int, variant: Optional[str] = None) -> Result:
+    """Execute a part of a solution file, silencing its prints.
+    Errors are caught and reported in the result so one day can't stop the others."""
+    year, day = _date_of(path)
+    try:
+        fn = find_part(import_day(path), part, variant)
+        with redirect_stdout(io.StringIO()):
+            return fn.execute()
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return Result(year, day, part, None, 0., error=f"{type(e).__name__}: {e}", variant=variant)
+
+
+def run_task(path: Path, part: Optional[int]) -> list[Result]:
+    """Execute a part of a solution file, or a legacy solution file as a whole if `part` is None,
+    stopped after its timeout (see `aoc.legacy.default_timeout`)."""
+    return run_legacy(path, default_timeout()) if part is None else [run_part(path, part)]
+
+
+def run(year: int, days: Iterable[int] = (), jobs: Optional[int] = None, force: bool = False) -> list[Result]:
+    """Run all the parts of the given days of a year in a process pool.
+    The parts whose files and input are unchanged since their last run are not run again (see `aoc.incremental`),
+    unless `force` is set: their previous result is reused.
+    Returns the results sorted by day and part, after recording the new ones in the benchmark history."""
+    tasks: list[tuple[Path, Optional[int]]] = []
+    for p in discover(year, days):
+        tasks += [(p, None)] if is_legacy(p) else [(p, fn.part) for fn in parts_of(import_day(p))]
+    cached = {} if force else {t: results for t in tasks if (results := incremental.load(*t)) is not None}
+    todo = [t for t in tasks if t not in cached]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        ran = dict(zip(todo, pool.map(run_task, *zip(*todo)))) if todo else {}
+    for (path, part), results in ran.items():
+        incremental.store(path, part, results)
+
+    bench.record(r for results in ran.values() for r in results)
+    results = [r for task_results in (*cached.values(), *ran.values()) for r in task_results]
+    return sorted(results, key=lambda r: (r.day, r.part))
+
+
+def status(result: Result) -> str:
+    """Short verification status of a result."""
+    if result.error:
+        return "ERROR"
+    if result.verified is False:
+        return "WRONG"
+    if result.over_memory:
+        return "MEMORY"
+    if result.over_budget:
+        return "SLOW"
+    return {None: "?", True: "ok"}[result.verified]
+
+
+def failures(results: list[Result]) -> list[Result]:
+    """Results that failed: not run to the end, or failing their checks (see `Result.failures`),
+    thus wrong, over their memory limit, or over their time budget in strict mode."""
+    return [r for r in results if r.error or r.failures]
+
+
+def print_table(results: list[Result]) -> None:
+    """Print the results as a single aggregated table.
+    In benchmark mode, the time is the median and the other statistics are added, as the memory when tracked."""
+    bench, memory = any(r.stats for r in results), any(r.memory for r in results)
+    header = f"{'year':>4} {'day':>3} {'part':>4}  {'answer':<20} {'time':>10}"
+    if bench:
+        header += f" {'min':>10} {'p95':>10} {'stddev':>10}"
+    if memory:
+        header += f" {'memory':>10}"
+    print(header + "  status")
+    print("-" * (len(header) + 8))
+    for r in results:
+        answer = r.error if r.error else r.answer
+        row = f"{r.year:>4} {r.day:>3} {r.part:>4}  {str(answer):<20} {r.execution_time:>9.5f}s"
+        if bench:
+            row += f" {r.stats.min:>9.5f}s {r.stats.p95:>9.5f}s {r.stats.stddev:>9.5f}s" if r.stats else " " * 33
+        if memory:
+            row += f" {r.memory.peak:>8.1f}MB" if r.memory else " " * 11
+        print(f"{row}  {status(r)}{' (cached)' if r.cached else ''}")
+    print("-" * (len(header) + 8))
+    print(f"{len(results)} parts, total execution time: {sum(r.execution_time for r in results):.5f}s")
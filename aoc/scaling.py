@@ -0,0 +1,103 @@
+"""Scaling benchmark: time the parts of some days on generated inputs of growing size (see `aoc.gen`),
+and fit the exponent `k` of their complexity, `time ~ size^k` with the size of the input in bytes,
+as the slope of the log-log curve. Used through `python -m aoc bench 2024 [days...] --scale 1,2,4,8`,
+which also plots the curves in `.aoc/scaling/{year}-{day}.png` at the root of the repository."""
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from math import log
+from pathlib import Path
+from typing import Optional
+import os
+import statistics
+
+from .cache import STATE
+from .gen import GENERATORS, generate
+from .lazy import lazy_import
+from .legacy import default_timeout, is_legacy, run_legacy
+from .runner import discover, import_day, parts_of, run_part
+
+plt = lazy_import("matplotlib.pyplot")
+
+
+@dataclass
+class Scaling:
+    """Timings of a part on inputs of growing size, in bytes and seconds."""
+    year: int
+    day: int
+    part: int
+    scales: list[float] = field(default_factory=list)
+    sizes: list[int] = field(default_factory=list)
+    times: list[float] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def exponent(self) -> Optional[float]:
+        """Fitted exponent of the complexity, None without at least two distinct sizes."""
+        points = [(log(s), log(t)) for s, t in zip(self.sizes, self.times) if s and t]
+        if len({x for x, _ in points}) < 2:
+            return None
+        return statistics.linear_regression(*zip(*points)).slope
+
+
+def scaling(year: int, days: Iterable[int], scales: list[float], repetitions: int = 3) -> list[Scaling]:
+    """Benchmark the parts of the days of a year having a generator, on an input generated at each scale.
+    Parts are run one after the other, so that their timings are steady. A part stops at its first error.
+    Legacy days (see `aoc.legacy`) are run as a whole at each scale."""
+    os.environ["AOC_BENCH"] = str(repetitions)
+    results = []
+    for path in discover(year, days):
+        day = int(path.stem)
+        if (year, day) not in GENERATORS:
+            continue
+        parts = {}
+        for scale in scales:
+            input_ = generate(year, day, scale)
+            os.environ["AOC_INPUT"] = str(input_)
+            failed = {part for part, s in parts.items() if s.error}
+            if is_legacy(path):  # run as a whole
+                runs = run_legacy(path, default_timeout())
+            else:
+                runs = [run_part(path, fn.part) for fn in parts_of(import_day(path)) if fn.part not in failed]
+            for result in runs:
+                s = parts.setdefault(result.part, Scaling(year, day, result.part))
+                if s.error:
+                    continue
+                if result.error:
+                    s.error = f"x{scale:g}: {result.error}"
+                    continue
+                s.scales.append(scale)
+                s.sizes.append(input_.stat().st_size)
+                s.times.append(result.execution_time)
+        results += sorted(parts.values(), key=lambda s: s.part)
+    os.environ.pop("AOC_INPUT", None)
+    return results
+
+
+def plot(results: list[Scaling], directory: Path = STATE / "scaling") -> list[Path]:
+    """Plot the time against the size of the input of each day, on a log-log scale. Returns the paths of the plots."""
+    directory.mkdir(exist_ok=True, parents=True)
+    paths = []
+    for year, day in dict.fromkeys((s.year, s.day) for s in results):
+        fig, ax = plt.subplots()
+        for s in (s for s in results if (s.year, s.day) == (year, day) and s.times):
+            k = s.exponent
+            ax.loglog(s.sizes, s.times, "o-", label=f"part {s.part}" + (f" (k = {k:.2f})" if k is not None else ""))
+        ax.set(title=f"{year} day {day}", xlabel="input size (bytes)", ylabel="time (s)")
+        ax.grid(True, which="both", alpha=.3)
+        ax.legend()
+        paths.append(directory / f"{year}-{day}.png")
+        fig.savefig(paths[-1])
+        plt.close(fig)
+    return paths
+
+
+def print_table(results: list[Scaling], scales: list[float]) -> None:
+    header = f"{'year':>4} {'day':>3} {'part':>4}  " + " ".join(f"{f'x{s:g}':>10}" for s in scales) + f" {'k':>6}"
+    print(header)
+    print("-" * len(header))
+    for s in results:
+        times = (f"{t:>9.5f}s" for t in s.times)
+        k = f"{s.exponent:>6.2f}" if s.exponent is not None else f"{'-':>6}"
+        print(f"{s.year:>4} {s.day:>3} {s.part:>4}  " + " ".join(times) + " " * 11 * (len(scales) - len(s.times))
+              + f" {k}" + (f"  {s.error}" if s.error else ""))
+    print("-" * len(header))
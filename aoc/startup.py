@@ -0,0 +1,78 @@
+"""Startup benchmark: cold time from the launch of the interpreter to the first answer of each day,
+along with the import time parsed from `-X importtime`. Used through `python -m aoc startup 2024 [days...]`."""
+from dataclasses import dataclass, field
+from pathlib import Path
+from subprocess import PIPE, Popen
+from time import perf_counter
+from typing import Optional
+import os
+import sys
+import tempfile
+import threading
+
+from .runner import discover
+
+
+@dataclass
+class Startup:
+    """Startup of a day: time to its first answer and time spent importing, in seconds."""
+    year: int
+    day: int
+    first_answer: Optional[float]
+    imports: float
+    top: list[tuple[str, float]] = field(default_factory=list)
+
+
+def parse_importtime(log: str) -> list[tuple[str, float]]:
+    """Cumulative import time in seconds of the top level imports of a `-X importtime` log, slowest first."""
+    imports = []
+    for line in log.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        if name.startswith("  "):
+            continue  # nested import, already counted by its parent
+        imports.append((name.strip(), int(cumulative) / 1e6))
+    return sorted(imports, key=lambda i: -i[1])
+
+
+def measure(path: Path, timeout: float = 60.) -> Startup:
+    """Launch a solution file in a fresh interpreter and stop it at its first answer (or after the timeout)."""
+    year, day = int(path.parent.name), int(path.stem)
+    env = {**os.environ, "PYTHONUNBUFFERED": "1", "AOC_HISTORY": ""}
+    with tempfile.TemporaryFile() as log:
+        t0 = perf_counter()
+        process = Popen([sys.executable, "-X", "importtime", str(path)], stdout=PIPE, stderr=log, env=env, text=True)
+        timer = threading.Timer(timeout, process.kill)
+        timer.start()
+        first_answer = None
+        assert process.stdout is not None
+        for line in process.stdout:
+            if "Answer to part" in line:
+                first_answer = perf_counter() - t0
+                break
+        timer.cancel()
+        process.kill()
+        process.wait()
+        process.stdout.close()
+        log.seek(0)
+        imports = parse_importtime(log.read().decode(errors="replace"))
+    return Startup(year, day, first_answer, sum(t for _, t in imports), imports[:3])
+
+
+def startup(year: int, days: list[int], repetitions: int = 3) -> list[Startup]:
+    """Measure the startup of the days of a year, keeping the fastest of some repetitions."""
+    def key(s: Startup) -> float:
+        return s.first_answer if s.first_answer is not None else float("inf")
+    return [min((measure(p) for _ in range(repetitions)), key=key) for p in discover(year, days)]
+
+
+def print_table(startups: list[Startup]) -> None:
+    print(f"{'year':>4} {'day':>3}  {'answer':>10} {'imports':>10} {'share':>6}  heaviest imports")
+    print("-" * 80)
+    for s in startups:
+        answer = f"{s.first_answer:>9.5f}s" if s.first_answer is not None else f"{'-':>10}"
+        share = f"{s.imports / s.first_answer:>6.0%}" if s.first_answer else f"{'-':>6}"
+        top = ", ".join(f"{name} {t * 1000:.0f}ms" for name, t in s.top)
+        print(f"{s.year:>4} {s.day:>3}  {answer} {s.imports:>9.5f}s {share}  {top}")
+    print("-" * 80)
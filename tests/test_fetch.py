@@ -0,0 +1,97 @@
+"""Tests of `aoc.fetch` against a local stand-in server, selected with `AOC_URL`.
+Run from the root directory: `python -m unittest discover tests`."""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from time import monotonic
+from unittest import mock
+import os
+import threading
+import unittest
+
+import requests
+
+from aoc import fetch
+
+
+class Handler(BaseHTTPRequestHandler):
+    """Answers each request with the next planned response of its path, 200 with the input once they are all used.
+    Keeps the connections alive, and logs the client port and cookie of each request."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.server.log.append((self.path, self.client_address[1], self.headers.get("Cookie")))
+        planned = self.server.plan.get(self.path, [])
+        status, headers = planned.pop(0) if planned else (200, {})
+        body = f"input of {self.path}\n".encode() if status == 200 else b"error"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class TestFetch(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.plan, self.server.log = {}, []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        directory = TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        self.cookie = self.directory / ".session"
+        self.cookie.write_text("secret\n", encoding="utf-8")
+
+        env = mock.patch.dict(os.environ, {"AOC_URL": f"http://127.0.0.1:{self.server.server_port}"})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_retry_server_error(self) -> None:
+        self.server.plan["/2024/day/1/input"] = [(500, {}), (502, {})]
+        output = self.directory / "1.txt"
+        with fetch.make_session(self.cookie) as session:
+            fetch.fetch_input(session, 1, 2024, output, backoff=0.)
+        self.assertEqual(output.read_text(), "input of /2024/day/1/input\n")
+        self.assertEqual(len(self.server.log), 3)
+
+    def test_fail_not_found(self) -> None:
+        self.server.plan["/2024/day/1/input"] = [(404, {})]
+        output = self.directory / "1.txt"
+        with fetch.make_session(self.cookie) as session, self.assertRaises(requests.HTTPError):
+            fetch.fetch_input(session, 1, 2024, output, backoff=0.)
+        self.assertFalse(output.exists())
+        self.assertEqual(len(self.server.log), 1)
+
+    def test_retry_after(self) -> None:
+        # the delay asked by the server replaces the (long) backoff, in seconds or as a date
+        self.server.plan["/2024/day/1/input"] = [
+            (429, {"Retry-After": "0"}), (503, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})
+        ]
+        start = monotonic()
+        with fetch.make_session(self.cookie) as session:
+            fetch.fetch_input(session, 1, 2024, self.directory / "1.txt", backoff=60.)
+        self.assertLess(monotonic() - start, 5.)
+        self.assertEqual(len(self.server.log), 3)
+
+    def test_session_reused(self) -> None:
+        # a single connection for all the days, authenticated with the cookie
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        self.addCleanup(os.chdir, cwd)
+        status = fetch.fetch(2024, [1, 2, 3], jobs=1, interval=0., cookie=self.cookie)
+        self.assertEqual(status, {1: "downloaded", 2: "downloaded", 3: "downloaded"})
+        self.assertEqual(len({port for _, port, _ in self.server.log}), 1)
+        self.assertEqual({cookie for _, _, cookie in self.server.log}, {"session=secret"})
+        self.assertTrue((self.directory / "2024" / "inputs" / "3.txt").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()